@@ -1,8 +1,13 @@
 """
 Campaign API endpoints
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from datetime import datetime
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from app.api.deps import get_current_active_user
 from app.models.user import User
@@ -12,12 +17,85 @@ from app.services.campaign_service import CampaignService
 from app.services.business_service import BusinessService
 from app.core.config import settings
 from app.core.constants import DEFAULT_CURRENCY as CONSTANT_DEFAULT_CURRENCY
-from app.core.exceptions import NotFoundError
+from app.core.exceptions import NotFoundError, ValidationError
 
 
 router = APIRouter(prefix="/campaign/groups", tags=["campaigns"])
 
 
+def _encode_cursor(campaign) -> str:
+    """Page cursor for the campaign's position in the (created_at, _id) sort"""
+    return f"{campaign.created_at.isoformat()}_{campaign.id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """Parse a cursor made by _encode_cursor"""
+    created_at, _, campaign_id = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(created_at), ObjectId(campaign_id)
+    except (ValueError, InvalidId):
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+
+
+def _campaign_group_response(campaign) -> CampaignResponse:
+    """Convert a Campaign document to a campaign group entry (Shown format)"""
+    campaign_id = str(campaign.id) if hasattr(campaign, 'id') else str(campaign._id)
+    
+    # Determine conversion goal ID (matching Shown's format)
+    conversion_goal_id = 0
+    if campaign.conversion_goal == ConversionGoal.BRAND_AWARENESS:
+        conversion_goal_id = 5
+    elif campaign.conversion_goal == ConversionGoal.ONLINE_LEADS:
+        conversion_goal_id = 1
+    elif campaign.conversion_goal == ConversionGoal.ONLINE_SALES:
+        conversion_goal_id = 2
+    
+    return CampaignResponse(
+        id=campaign_id,
+        business_id=campaign.business_id,
+        user_id=campaign.user_id,
+        title=campaign.title,
+        url=campaign.url,
+        phone=campaign.phone,
+        conversion_goal={
+            "id": conversion_goal_id,
+            "name": campaign.conversion_goal.value.replace("-", " ").title(),
+            "icon": campaign.conversion_goal_icon.value,
+        },
+        conversion=campaign.conversion,
+        can_have_conversions=campaign.can_have_conversions,
+        data_source=campaign.data_source,
+        budget={
+            "currency": campaign.budget_currency,
+            "daily_budget": campaign.daily_budget,
+        },
+        bidding_strategy={
+            "type": campaign.bidding_strategy_type.value,
+            "max_bid": campaign.max_bid,
+            "target_amount": campaign.target_amount,
+            "revenue_on_ad_spend": campaign.revenue_on_ad_spend,
+        },
+        supported_bidding_strategy_types=campaign.supported_bidding_strategy_types,
+        recommended_platform=campaign.recommended_platform_id,
+        supported_platforms=campaign.supported_platform_ids,
+        demographics={
+            "languages": campaign.demographics_languages,
+            "locations_countries": campaign.demographics_locations_countries,
+            "location_areas": campaign.demographics_location_areas,
+        },
+        time_ranges=campaign.time_ranges,
+        time_period=campaign.time_period,
+        website_industry=campaign.website_industry if campaign.website_industry else "",
+        sitelinks=campaign.sitelinks,
+        campaigns=campaign.campaigns,
+        metrics=campaign.metrics,
+        status=campaign.status,
+        created_at=campaign.created_at,
+        updated_at=campaign.updated_at,
+        is_imported=False,
+    )
+
+
 @router.get(
     "",
     response_model=CampaignListResponse,
@@ -27,89 +105,31 @@ async def get_all_campaigns(
     current_user: User = Depends(get_current_active_user),
     date_start: Optional[str] = None,
     date_end: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
 ):
     """
-    Get all campaigns for the current user.
+    Get all campaigns for the current user, newest first, one page at a time.
     Returns campaigns in Shown format with campaign_groups, total metrics, and filters.
+    Totals cover all of the user's campaigns; pass next_cursor back as cursor for the next page.
     """
-    campaigns = await CampaignService.get_all_user_campaigns(
-        user_id=current_user.clerk_id,
+    # The page and the account-wide totals are independent reads
+    (campaigns, has_more), totals = await asyncio.gather(
+        CampaignService.get_all_user_campaigns(
+            user_id=current_user.clerk_id,
+            limit=limit,
+            cursor=_decode_cursor(cursor) if cursor else None,
+        ),
+        CampaignService.get_user_campaign_totals(current_user.clerk_id),
     )
     
     # Convert to response format
-    campaign_groups = []
-    total_impressions = 0
-    total_clicks = 0
-    total_cost = 0.0
-    total_conversions = 0
-    total_daily_budget = 0.0
-    
-    for campaign in campaigns:
-        campaign_id = str(campaign.id) if hasattr(campaign, 'id') else str(campaign._id)
-        
-        # Calculate metrics from campaign
-        campaign_metrics = campaign.metrics if campaign.metrics else []
-        for metric in campaign_metrics:
-            total_impressions += metric.get("impressions", 0) if metric.get("impressions") else 0
-            total_clicks += metric.get("clicks", 0) if metric.get("clicks") else 0
-            total_cost += float(metric.get("cost", 0)) if metric.get("cost") else 0.0
-            total_conversions += metric.get("conversions", 0) if metric.get("conversions") else 0
-        
-        total_daily_budget += campaign.daily_budget if campaign.daily_budget else 0.0
-        
-        # Determine conversion goal ID (matching Shown's format)
-        conversion_goal_id = 0
-        if campaign.conversion_goal == ConversionGoal.BRAND_AWARENESS:
-            conversion_goal_id = 5
-        elif campaign.conversion_goal == ConversionGoal.ONLINE_LEADS:
-            conversion_goal_id = 1
-        elif campaign.conversion_goal == ConversionGoal.ONLINE_SALES:
-            conversion_goal_id = 2
-        
-        campaign_groups.append(CampaignResponse(
-            id=campaign_id,
-            business_id=campaign.business_id,
-            user_id=campaign.user_id,
-            title=campaign.title,
-            url=campaign.url,
-            phone=campaign.phone,
-            conversion_goal={
-                "id": conversion_goal_id,
-                "name": campaign.conversion_goal.value.replace("-", " ").title(),
-                "icon": campaign.conversion_goal_icon.value,
-            },
-            conversion=campaign.conversion,
-            can_have_conversions=campaign.can_have_conversions,
-            data_source=campaign.data_source,
-            budget={
-                "currency": campaign.budget_currency,
-                "daily_budget": campaign.daily_budget,
-            },
-            bidding_strategy={
-                "type": campaign.bidding_strategy_type.value,
-                "max_bid": campaign.max_bid,
-                "target_amount": campaign.target_amount,
-                "revenue_on_ad_spend": campaign.revenue_on_ad_spend,
-            },
-            supported_bidding_strategy_types=campaign.supported_bidding_strategy_types,
-            recommended_platform=campaign.recommended_platform_id,
-            supported_platforms=campaign.supported_platform_ids,
-            demographics={
-                "languages": campaign.demographics_languages,
-                "locations_countries": campaign.demographics_locations_countries,
-                "location_areas": campaign.demographics_location_areas,
-            },
-            time_ranges=campaign.time_ranges,
-            time_period=campaign.time_period,
-            website_industry=campaign.website_industry if campaign.website_industry else "",
-            sitelinks=campaign.sitelinks,
-            campaigns=campaign.campaigns,
-            metrics=campaign.metrics,
-            status=campaign.status,
-            created_at=campaign.created_at,
-            updated_at=campaign.updated_at,
-            is_imported=False,
-        ))
+    campaign_groups = [_campaign_group_response(campaign) for campaign in campaigns]
+    total_impressions = totals["impressions"]
+    total_clicks = totals["clicks"]
+    total_cost = totals["cost"]
+    total_conversions = totals["conversions"]
+    total_daily_budget = totals["daily_budget"]
     
     # Calculate totals
     total_ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0.0
@@ -152,9 +172,28 @@ async def get_all_campaigns(
             "date_start": date_start,
             "date_end": date_end,
         },
+        next_cursor=_encode_cursor(campaigns[-1]) if has_more else None,
     )
 
 
+@router.get(
+    "/stream",
+    summary="Stream all campaigns for the current user as JSON lines",
+)
+async def stream_campaigns(
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream every campaign for the current user, newest first.
+    One campaign group (Shown format) per line; rows are sent as they are read from MongoDB.
+    """
+    async def lines():
+        async for campaign in CampaignService.get_all_user_campaigns_stream(current_user.clerk_id):
+            yield _campaign_group_response(campaign).model_dump_json() + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/create",
     response_model=CampaignResponse,
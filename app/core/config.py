@@ -22,6 +22,9 @@ class Settings(BaseSettings):
     # MongoDB
     MONGODB_URL: str
     MONGODB_DB_NAME: str = "admaster"
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 10  # Keep warm connections so bursts don't pay the handshake
+    MONGODB_MAX_IDLE_TIME_MS: int = 30000
     
     # Clerk Authentication
     CLERK_SECRET_KEY: str
@@ -41,6 +44,12 @@ class Settings(BaseSettings):
     DEFAULT_CURRENCY: Optional[str] = None  # Default currency code (e.g., "INR", "USD")
     DEFAULT_DAILY_BUDGET: Optional[float] = None  # Default daily budget (e.g., 0.0)
     
+    # Campaign insert batching (coalesce concurrent creates into one insert_many)
+    CAMPAIGN_INSERT_BATCHING: bool = True  # Disable for latency-sensitive deployments
+    CAMPAIGN_INSERT_BATCH_WINDOW_MS: int = 10
+    CAMPAIGN_INSERT_BATCH_SIZE: int = 100
+    CAMPAIGN_INSERT_TIMEOUT_SECONDS: float = 10.0  # Wait for a batched insert before inserting directly
+    
     # Note: Gemini AI configuration (GOOGLE_API_KEY, GEMINI_MODEL, DEFAULT_MODEL) 
     # is handled directly via os.getenv() in the service code, not through Settings
     
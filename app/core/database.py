@@ -24,7 +24,12 @@ class Database:
         """Connect to MongoDB"""
         try:
             # Create MongoDB client
-            cls.client = AsyncIOMotorClient(settings.MONGODB_URL)
+            cls.client = AsyncIOMotorClient(
+                settings.MONGODB_URL,
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGODB_MAX_IDLE_TIME_MS,
+            )
             cls.db = cls.client[settings.MONGODB_DB_NAME]
             
             # Initialize Beanie ODM with models
@@ -11,6 +11,7 @@ load_dotenv()
 
 from app.core.config import settings
 from app.core.database import db
+from app.services.campaign_insert_batcher import CampaignInsertBatcher
 from app.core.exceptions import AdMasterException
 from app.core.error_handler import (
     admaster_exception_handler,
@@ -30,12 +31,14 @@ async def lifespan(app: FastAPI):
     # Startup
     print("🚀 Starting AdMaster AI Backend...")
     await db.connect_db()
+    CampaignInsertBatcher.start()
     print(f"✅ Server running on {settings.HOST}:{settings.PORT}")
     
     yield
     
     # Shutdown
     print("👋 Shutting down...")
+    await CampaignInsertBatcher.stop()
     await db.close_db()
 
 
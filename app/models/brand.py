@@ -3,7 +3,7 @@ Brand model - stores brand information extracted by AdMaster-Crawler
 Each brand belongs to a business
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from beanie import Document
 from pydantic import Field
 
@@ -51,6 +51,16 @@ class Brand(Document):
             }
         }
     
+    def build_prompt_context(self) -> Dict[str, Any]:
+        """Build the prompt-ready brand fields stored in Business.prompt_context_cache["brand"]"""
+        return {
+            "version": self.updated_at,  # Stale once updated_at moves on
+            "brand_description": self.description,
+            "brand_colors": list(self.brand_colors),
+            "brand_tone": list(self.tone_of_voice),
+            "brand_language": self.language,
+        }
+    
     async def update_brand_info(
         self,
         description: Optional[str] = None,
@@ -2,7 +2,7 @@
 Business model - Main entity for AdMaster AI
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 from enum import Enum
 from beanie import Document
 from pydantic import Field
@@ -59,6 +59,10 @@ class Business(Document):
     # Status
     status: BusinessStatus = BusinessStatus.ACTIVE
     
+    # Prompt-ready fields for AI platform analysis, precomputed on write
+    # {"business": {...}, "brand": {...}} - each part carries the "version" it was built from
+    prompt_context_cache: Dict[str, Any] = Field(default_factory=dict)
+    
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -83,6 +87,15 @@ class Business(Document):
             }
         }
     
+    def build_prompt_context(self) -> Dict[str, Any]:
+        """Build the prompt-ready business fields stored in prompt_context_cache["business"]"""
+        return {
+            "version": self.updated_at,  # Stale once updated_at moves on
+            "business_name": self.name,
+            "business_industry": self.industry.value if self.industry else "Unknown",
+            "website_url": str(self.website),
+        }
+    
     async def archive(self):
         """Archive this business"""
         self.status = BusinessStatus.ARCHIVED
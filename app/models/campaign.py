@@ -114,6 +114,7 @@ class Campaign(Document):
             "status",
             [("business_id", 1), ("created_at", -1)],
             [("user_id", 1), ("status", 1)],
+            [("user_id", 1), ("created_at", -1), ("_id", -1)],  # get_all_user_campaigns pages
         ]
     
     class Config:
@@ -66,6 +66,7 @@ class Platform(Document):
             "slug",
             "type",
             "is_active",
+            [("is_active", 1), ("best_for_goals", 1)],  # recommend_platforms goal lookup
         ]
     
     class Config:
@@ -101,3 +101,4 @@ class CampaignListResponse(BaseModel):
     campaign_groups: List[CampaignResponse]
     total: Dict[str, Any]  # {"metrics": {...}, "budget": {...}}
     filters: Dict[str, Any]  # {"date_start": "...", "date_end": "..."}
+    next_cursor: Optional[str] = None  # "<created_at ISO>_<campaign id>" - pass as ?cursor= for the next page (None on the last page)
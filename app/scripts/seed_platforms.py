@@ -3,6 +3,7 @@ Script to seed platforms into the database
 Run this once to populate platforms
 """
 import asyncio
+from pydantic import BaseModel
 from app.core.database import db
 from app.models.platform import Platform, PlatformType
 
@@ -175,21 +176,43 @@ PLATFORMS_DATA = [
 ]
 
 
+# Platforms keyed by platform_id - existence checks and dedup are set operations on the keys
+PLATFORMS_BY_ID = {p["platform_id"]: p for p in PLATFORMS_DATA}
+
+
+class _PlatformIdProjection(BaseModel):
+    """Projection that fetches only platform_id (existence checks)"""
+    platform_id: int
+
+
 async def seed_platforms():
     """Seed platforms into database"""
     await db.connect_db()
     
     print("🌱 Seeding platforms...")
     
-    for platform_data in PLATFORMS_DATA:
-        existing = await Platform.find_one(Platform.platform_id == platform_data["platform_id"])
-        if existing:
+    # Check which platforms already exist - one query, only platform_id comes back
+    existing_ids = {
+        platform.platform_id
+        for platform in await Platform.find(
+            {"platform_id": {"$in": list(PLATFORMS_BY_ID)}},
+            projection_model=_PlatformIdProjection,
+        ).to_list()
+    }
+    
+    # Walk PLATFORMS_BY_ID in order so inserts and the report are the same every run
+    to_insert = []
+    for platform_id, platform_data in PLATFORMS_BY_ID.items():
+        if platform_id in existing_ids:
             print(f"⏭️  Platform {platform_data['name']} already exists, skipping...")
             continue
-        
-        platform = Platform(**platform_data)
-        await platform.insert()
-        print(f"✅ Created platform: {platform_data['name']}")
+        to_insert.append(Platform(**platform_data))
+    
+    # Insert the missing platforms in one round-trip
+    if to_insert:
+        await Platform.insert_many(to_insert, ordered=False)
+        for platform in to_insert:
+            print(f"✅ Created platform: {platform.name}")
     
     print("✅ Platform seeding complete!")
     await db.close_db()
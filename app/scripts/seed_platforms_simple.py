@@ -210,6 +210,10 @@ PLATFORMS_DATA = [
 ]
 
 
+# Platforms keyed by platform_id - existence checks and dedup are set operations on the keys
+PLATFORMS_BY_ID = {p["platform_id"]: p for p in PLATFORMS_DATA}
+
+
 def seed_platforms():
     """Seed platforms into database"""
     client = None
@@ -221,19 +225,28 @@ def seed_platforms():
         
         print("🌱 Seeding platforms...")
         
-        for platform_data in PLATFORMS_DATA:
-            # Check if platform already exists
-            existing = platforms_collection.find_one(
-                {"platform_id": platform_data["platform_id"]}
+        # Check which platforms already exist - one query, only platform_id comes back
+        existing_ids = {
+            doc["platform_id"]
+            for doc in platforms_collection.find(
+                {"platform_id": {"$in": list(PLATFORMS_BY_ID)}},
+                {"_id": 0, "platform_id": 1},
             )
-            
-            if existing:
+        }
+        
+        # Walk PLATFORMS_BY_ID in order so inserts and the report are the same every run
+        to_insert = []
+        for platform_id, platform_data in PLATFORMS_BY_ID.items():
+            if platform_id in existing_ids:
                 print(f"⏭️  Platform {platform_data['name']} already exists, skipping...")
                 continue
-            
-            # Insert platform
-            platforms_collection.insert_one(platform_data)
-            print(f"✅ Created platform: {platform_data['name']} (ID: {platform_data['platform_id']})")
+            to_insert.append(platform_data)
+        
+        # Insert the missing platforms in one round-trip
+        if to_insert:
+            platforms_collection.insert_many(to_insert, ordered=False)
+            for platform_data in to_insert:
+                print(f"✅ Created platform: {platform_data['name']} (ID: {platform_data['platform_id']})")
         
         # Count total platforms
         total = platforms_collection.count_documents({})
@@ -17,6 +17,9 @@ class AdMasterContentCrawlerService:
     Extracts comprehensive content for intelligence layer analysis
     """
     
+    # Leading characters of aggregated_text kept for the AI analysis prompt
+    PROMPT_TEXT_CHARS = 8000
+    
     def __init__(self, max_pages: int = 50, max_depth: int = 3):
         """
         Initialize content crawler
@@ -179,7 +182,12 @@ class AdMasterContentCrawlerService:
         # Queue: (url, depth)
         queue: List[tuple[str, int]] = [(start_url, 0)]
         
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
+        async with httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            http2=True,
+            headers={"Accept-Encoding": "br, gzip, deflate", "User-Agent": "AdMasterCrawler/1.0"},
+        ) as client:
             while queue and len(self.visited_urls) < self.max_pages:
                 url, depth = queue.pop(0)
                 
@@ -224,6 +232,7 @@ class AdMasterContentCrawlerService:
             'total_words': total_words,
             'pages': self.crawled_content,
             'aggregated_text': all_text,
+            'aggregated_text_prompt': all_text[:self.PROMPT_TEXT_CHARS],
             'crawled_at': datetime.utcnow().isoformat(),
         }
 
@@ -14,6 +14,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 from urllib.parse import urljoin
+import asyncio
+import codecs
 import re
 
 import httpx
@@ -30,6 +32,18 @@ class CrawlResult:
     language: str
 
 
+# HTTP/2 + brotli (httpx advertises "br" once the brotli package is installed)
+# keep transfer size and parse input small
+_REQUEST_HEADERS = {
+    "Accept-Encoding": "br, gzip, deflate",
+    "User-Agent": "AdMasterCrawler/1.0",
+}
+
+# link[rel] values that point at a favicon / touch icon
+_ICON_RELS = frozenset(
+    {"icon", "shortcut icon", "apple-touch-icon", "apple-touch-icon-precomposed", "mask-icon"}
+)
+
 _DEFAULT_TONES = [
     "Professional",
     "Casual",
@@ -39,17 +53,54 @@ _DEFAULT_TONES = [
     "Optimistic",
 ]
 
+# Common brand color variable names in CSS custom properties.
+# All color regexes capture "#"-prefixed hex, so hits only need lowercasing + clamping.
+_COLOR_VAR_PATTERNS = [
+    re.compile(r"--[^:]*primary[^:]*:\s*(#[0-9a-fA-F]{3,8})", re.I),
+    re.compile(r"--[^:]*brand[^:]*:\s*(#[0-9a-fA-F]{3,8})", re.I),
+    re.compile(r"--[^:]*main[^:]*:\s*(#[0-9a-fA-F]{3,8})", re.I),
+    re.compile(r"--[^:]*accent[^:]*:\s*(#[0-9a-fA-F]{3,8})", re.I),
+    re.compile(r"--[^:]*color[^:]*:\s*(#[0-9a-fA-F]{3,8})", re.I),
+]
+_INLINE_STYLE_RE = re.compile(r"(?:background-|border-)?color\s*:\s*(#[0-9a-fA-F]{3,8})", re.I)
+_CSS_COLOR_RE = re.compile(r"(?:background-|border-|color)\s*:\s*(#[0-9a-fA-F]{3,8})", re.I)
+_NEUTRAL_COLORS = frozenset(
+    {"#ffffff", "#000000", "#f5f5f5", "#e5e5e5", "#cccccc", "#999999", "#666666", "#333333"}
+)
+# Validates raw meta content values (regex hits above are already valid hex)
+_HEX_COLOR_RE = re.compile(r"#?[0-9a-fA-F]{3,8}")
+_COLOR_META_NAMES = ("msapplication-tilecolor", "apple-mobile-web-app-status-bar-style")
+
 
 class AdMasterCrawlerService:
     """Lightweight crawler to extract brand intel."""
 
+    # Response bodies are truncated to this many bytes before parsing
+    MAX_BYTES = 1 << 20
+    # Language detection quality plateaus after a few hundred tokens
+    MAX_DETECT_CHARS = 2048
+
     @staticmethod
     async def fetch_html(url: str) -> Tuple[str, str]:
-        async with httpx.AsyncClient(follow_redirects=True, timeout=20) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            base_url = str(resp.url)
-            return resp.text, base_url
+        max_bytes = AdMasterCrawlerService.MAX_BYTES
+        async with httpx.AsyncClient(
+            follow_redirects=True, timeout=20, http2=True, headers=_REQUEST_HEADERS
+        ) as client:
+            async with client.stream("GET", url) as resp:
+                resp.raise_for_status()
+                base_url = str(resp.url)
+                # Decode chunks as they arrive so decoding overlaps the download
+                decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+                parts: List[str] = []
+                size = 0
+                async for chunk in resp.aiter_bytes():
+                    chunk = chunk[: max_bytes - size]
+                    size += len(chunk)
+                    parts.append(decoder.decode(chunk))
+                    if size >= max_bytes:
+                        break
+                parts.append(decoder.decode(b"", final=True))
+                return "".join(parts), base_url
 
     @staticmethod
     def _extract_description(soup: BeautifulSoup) -> str:
@@ -78,9 +129,9 @@ class AdMasterCrawlerService:
             for tag in soup.find_all(tag_name):
                 # Normalize rel list
                 if tag_name == "link":
-                    rel = tag.get("rel") or []
-                    rel_set = {r.lower() for r in (rel if isinstance(rel, list) else [rel])}
-                    if rel_set & {"icon", "shortcut icon", "apple-touch-icon"}:
+                    rel = tag.get("rel") or ()
+                    rel_set = frozenset(r.lower() for r in (rel if isinstance(rel, (list, tuple)) else (rel,)))
+                    if not _ICON_RELS.isdisjoint(rel_set):
                         href = tag.get("href")
                         if href:
                             return urljoin(base_url, href)
@@ -122,78 +173,55 @@ class AdMasterCrawlerService:
 
     @staticmethod
     def _extract_theme_colors(soup: BeautifulSoup) -> List[str]:
-        colors: List[str] = []
-
-        # Priority 1: meta theme-color (most reliable)
-        for meta in soup.find_all("meta", attrs={"name": "theme-color"}):
-            content = (meta.get("content") or "").strip()
-            if AdMasterCrawlerService._is_hex_color(content):
-                colors.append(AdMasterCrawlerService._normalize_hex(content))
-
-        # Priority 2: CSS variables in inline <style> tags
-        # Look for common brand color variable names
-        color_var_patterns = [
-            r"--[^:]*primary[^:]*:\s*(#[0-9a-fA-F]{3,8})",
-            r"--[^:]*brand[^:]*:\s*(#[0-9a-fA-F]{3,8})",
-            r"--[^:]*main[^:]*:\s*(#[0-9a-fA-F]{3,8})",
-            r"--[^:]*accent[^:]*:\s*(#[0-9a-fA-F]{3,8})",
-            r"--[^:]*color[^:]*:\s*(#[0-9a-fA-F]{3,8})",
-        ]
-        for style in soup.find_all("style"):
-            text = style.get_text("\n")
-            for pattern in color_var_patterns:
-                for match in re.findall(pattern, text, re.I):
-                    colors.append(AdMasterCrawlerService._normalize_hex(match))
-
-        # Priority 3: Extract hex colors from inline styles and CSS
-        # Look for background-color, color, border-color in inline styles
-        inline_style_pattern = r"(?:background-|border-)?color\s*:\s*(#[0-9a-fA-F]{3,8})"
-        for element in soup.find_all(attrs={"style": True}):
-            style_attr = element.get("style", "")
-            for match in re.findall(inline_style_pattern, style_attr, re.I):
-                colors.append(AdMasterCrawlerService._normalize_hex(match))
-
-        # Priority 4: Extract from <style> tags (not just variables)
-        # Look for actual color declarations in CSS
-        css_color_pattern = r"(?:background-|border-|color)\s*:\s*(#[0-9a-fA-F]{3,8})"
-        for style in soup.find_all("style"):
-            text = style.get_text("\n")
-            # Find colors in CSS rules (avoid common grays/whites)
-            for match in re.findall(css_color_pattern, text, re.I):
-                hex_color = AdMasterCrawlerService._normalize_hex(match)
-                # Filter out common neutral colors
-                if hex_color not in ["#ffffff", "#000000", "#f5f5f5", "#e5e5e5", "#cccccc", "#999999", "#666666", "#333333"]:
-                    colors.append(hex_color)
-
-        # Priority 5: Check for common color meta tags
-        color_meta_names = ["msapplication-TileColor", "apple-mobile-web-app-status-bar-style"]
-        for meta in soup.find_all("meta"):
-            name = meta.get("name", "").lower()
-            if any(color_name in name for color_name in color_meta_names):
-                content = (meta.get("content") or "").strip()
-                if AdMasterCrawlerService._is_hex_color(content):
-                    colors.append(AdMasterCrawlerService._normalize_hex(content))
-
-        # Deduplicate while preserving order
-        dedup: List[str] = []
-        for c in colors:
-            if c not in dedup:
-                dedup.append(c)
-        
-        # Return up to 4 most common/relevant colors
-        return dedup[:4]
+        # Hits are bucketed per priority during a single walk over the document
+        theme_colors: List[str] = []
+        var_colors: List[str] = []
+        inline_colors: List[str] = []
+        css_colors: List[str] = []
+        meta_colors: List[str] = []
+
+        for el in soup.find_all(True):
+            if el.name == "meta":
+                name = (el.get("name") or "").lower()
+                content = (el.get("content") or "").strip()
+                # Priority 1: meta theme-color (most reliable)
+                if name == "theme-color":
+                    if AdMasterCrawlerService._is_hex_color(content):
+                        theme_colors.append(AdMasterCrawlerService._normalize_hex(content))
+                # Priority 5: Check for common color meta tags
+                elif any(color_name in name for color_name in _COLOR_META_NAMES):
+                    if AdMasterCrawlerService._is_hex_color(content):
+                        meta_colors.append(AdMasterCrawlerService._normalize_hex(content))
+            elif el.name == "style":
+                text = el.get_text("\n")
+                # Priority 2: CSS variables in inline <style> tags
+                for pattern in _COLOR_VAR_PATTERNS:
+                    var_colors.extend(match.lower()[:7] for match in pattern.findall(text))
+                # Priority 4: actual color declarations in CSS (avoid common grays/whites)
+                for match in _CSS_COLOR_RE.findall(text):
+                    hex_color = match.lower()[:7]
+                    if hex_color not in _NEUTRAL_COLORS:
+                        css_colors.append(hex_color)
+
+            # Priority 3: background-color, color, border-color in inline styles
+            style_attr = el.get("style")
+            if style_attr:
+                inline_colors.extend(match.lower()[:7] for match in _INLINE_STYLE_RE.findall(style_attr))
+
+        colors = theme_colors + var_colors + inline_colors + css_colors + meta_colors
+
+        # Deduplicate while preserving order, return up to 4 most relevant colors
+        return list(dict.fromkeys(colors))[:4]
 
     @staticmethod
     def _normalize_hex(value: str) -> str:
-        v = value.strip().lower()
-        if not v.startswith("#"):
-            v = "#" + v
-        # Clamp to 7 chars (#rrggbb)
-        return v[:7]
+        # Expects a stripped value; clamp to 7 chars (#rrggbb)
+        v = value.lower()
+        return (v if v.startswith("#") else "#" + v)[:7]
 
     @staticmethod
     def _is_hex_color(value: str) -> bool:
-        return bool(re.fullmatch(r"#?[0-9a-fA-F]{3,8}", value.strip()))
+        return _HEX_COLOR_RE.fullmatch(value) is not None
 
     @staticmethod
     def _detect_language(text: str, soup: BeautifulSoup) -> str:
@@ -204,7 +232,7 @@ class AdMasterCrawlerService:
         # Fallback: langdetect
         try:
             if text and len(text.split()) >= 10:
-                return detect(text)
+                return detect(text[: AdMasterCrawlerService.MAX_DETECT_CHARS])
         except LangDetectException:
             pass
         return "en"
@@ -228,8 +256,8 @@ class AdMasterCrawlerService:
         return ordered[:3]
 
     @staticmethod
-    async def crawl(website: str) -> CrawlResult:
-        html, base_url = await AdMasterCrawlerService.fetch_html(website)
+    def _sync_extract(html: str, base_url: str) -> CrawlResult:
+        """CPU-bound parse + extraction, run off the event loop by crawl()"""
         soup = BeautifulSoup(html, "lxml")
 
         description = AdMasterCrawlerService._extract_description(soup)
@@ -246,3 +274,7 @@ class AdMasterCrawlerService:
             language=language,
         )
 
+    @staticmethod
+    async def crawl(website: str) -> CrawlResult:
+        html, base_url = await AdMasterCrawlerService.fetch_html(website)
+        return await asyncio.to_thread(AdMasterCrawlerService._sync_extract, html, base_url)
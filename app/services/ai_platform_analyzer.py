@@ -3,12 +3,65 @@ AI Platform Analyzer - Uses Google Gemini 2.5 Flash to intelligently analyze con
 No fallbacks - requires GOOGLE_API_KEY or GEMINI_API_KEY environment variable
 """
 import os
+import re
 import json
-from typing import Dict, Any, List, Optional
+import asyncio
+import contextlib
+import copy
+import io
+import logging
+import time
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+import orjson
 from google import genai
 from app.models.campaign import ConversionGoal
 from app.models.business import Business
 from app.models.brand import Brand
+from app.services.admaster_content_crawler_service import AdMasterContentCrawlerService
+from app.services.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+# Gemini credentials/model are fixed for the life of the process - resolve once at import
+_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+_MODEL_NAME = os.getenv("GEMINI_MODEL") or os.getenv("DEFAULT_MODEL")
+
+# Embedding model used for semantic cache lookups
+EMBEDDING_MODEL = os.getenv("GEMINI_EMBEDDING_MODEL") or "text-embedding-004"
+
+# Process-wide cache of recommendation results (analyzers are created per request)
+_recommendation_cache = SemanticCache()
+
+# Content-type indicators - case-insensitive substring scans, no per-call lower() copies
+_ECOMMERCE_KEYWORDS_RE = re.compile(r"buy|shop|cart|checkout|product|price|add to cart|purchase", re.I)
+_VIDEO_RE = re.compile(r"video", re.I)
+_BLOG_URL_RE = re.compile(r"blog|article", re.I)
+
+# Leading ```/```json and trailing ``` around Gemini's JSON
+_CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```\s*$")
+
+# Upper bound on concurrent Gemini calls made by analyze_and_recommend_batch
+BATCH_MAX_CONCURRENCY = 8
+
+# Used to detect when a streamed response contains a complete JSON object
+_JSON_DECODER = json.JSONDecoder()
+
+# Platforms change at most once per deployment - keep the prompt-shaped list in-process
+PLATFORMS_CACHE_TTL_SECONDS = 300
+# (fetched_at, platforms_info, platforms_prompt_block, platform_ids) - the JSON block is serialized
+# once per refresh
+_platforms_cache: Optional[Tuple[float, List[Dict[str, Any]], str, FrozenSet[int]]] = None
+_platforms_cache_lock = asyncio.Lock()
+
+
+def _location_names(locations: Optional[List[Any]]) -> List[str]:
+    """Names of target locations given as dicts or Pydantic models"""
+    if not locations:
+        return []
+    return [
+        loc.get("name", "") if isinstance(loc, dict) else getattr(loc, "name", "")
+        for loc in locations
+    ]
 
 
 class AIPlatformAnalyzer:
@@ -32,7 +85,7 @@ class AIPlatformAnalyzer:
         if api_key:
             self.api_key = api_key
         else:
-            self.api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+            self.api_key = _API_KEY
         
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY environment variable is required. Please add it to your .env file.")
@@ -41,7 +94,7 @@ class AIPlatformAnalyzer:
         if model_name:
             self.model_name = model_name
         else:
-            self.model_name = os.getenv("GEMINI_MODEL") or os.getenv("DEFAULT_MODEL")
+            self.model_name = _MODEL_NAME
             if not self.model_name:
                 raise ValueError("GEMINI_MODEL or DEFAULT_MODEL environment variable is required. Please add it to your .env file.")
         
@@ -93,34 +146,149 @@ class AIPlatformAnalyzer:
             locations=locations,
         )
         
-        # Get available platforms from database
-        platforms_info = await self._get_platforms_info()
+        return await self._recommend(context, conversion_goal)
+    
+    async def analyze_and_recommend_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: int = BATCH_MAX_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Recommend platforms for several campaigns/businesses in one call
+        
+        Identical contexts are analyzed once, cached contexts never reach Gemini,
+        and the remaining Gemini calls run concurrently (bounded by max_concurrency).
+        
+        Args:
+            requests: Keyword arguments for analyze_and_recommend, one dict per item
+                (conversion_goal, business, brand, website_content, locations)
+            max_concurrency: Maximum number of in-flight Gemini calls
+        
+        Returns:
+            Results in the same order as requests (same shape as analyze_and_recommend)
+        """
+        contexts = [self._build_context(
+            conversion_goal=request["conversion_goal"],
+            business=request["business"],
+            brand=request.get("brand"),
+            website_content=request.get("website_content"),
+            locations=request.get("locations"),
+        ) for request in requests]
+        
+        # Group items sharing a fingerprint so each distinct context is analyzed once
+        unique: Dict[str, int] = {}
+        for i, context in enumerate(contexts):
+            unique.setdefault(SemanticCache.fingerprint(context), i)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def recommend(i: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._recommend(contexts[i], requests[i]["conversion_goal"])
+        
+        results = await asyncio.gather(*(recommend(i) for i in unique.values()))
+        by_fingerprint = dict(zip(unique.keys(), results))
+        
+        return [
+            copy.deepcopy(by_fingerprint[SemanticCache.fingerprint(context)])
+            for context in contexts
+        ]
+    
+    async def _recommend(self, context: Dict[str, Any], conversion_goal: ConversionGoal) -> Dict[str, Any]:
+        """Get a recommendation for a built context (semantic cache first, then Gemini)"""
+        # Serve identical / near-identical contexts from the semantic cache
+        fingerprint = SemanticCache.fingerprint(context)
+        scope = SemanticCache.scope(context)
+        
+        # Fetch available platforms from database while the cache is checked and the fingerprint
+        # embedded - cached results are only served while every platform they name still exists
+        platforms_task = asyncio.create_task(self._get_cached_platforms())
+        
+        cached = self._cache_call(_recommendation_cache.get_exact, fingerprint)
+        if cached is not None:
+            platform_ids = (await platforms_task)[3]
+            if self._resolves(cached, platform_ids):
+                logger.info("[CACHE] Recommendation served from cache (exact match)")
+                return cached
+            self._cache_call(_recommendation_cache.discard, fingerprint)
+        
+        embedding = await self._embed(fingerprint)
+        _, _, platforms_block, platform_ids = await platforms_task
+        if embedding is not None:
+            cached = self._cache_call(
+                _recommendation_cache.get_similar,
+                embedding,
+                scope,
+                lambda result: self._resolves(result, platform_ids),
+            )
+            if cached is not None:
+                logger.info("[CACHE] Recommendation served from cache (semantic match)")
+                return cached
         
         # Create refined prompt for Gemini
-        prompt = self._create_analysis_prompt(context, platforms_info, conversion_goal)
+        prompt = self._create_analysis_prompt(context, platforms_block, conversion_goal)
         
         try:
             # Call Gemini API (async)
-            print(f"🤖 Calling Gemini AI for platform recommendation...")
-            response = await self.async_client.models.generate_content(
+            logger.info("[AI] Calling Gemini AI for platform recommendation...")
+            stream = await self.async_client.models.generate_content_stream(
                 model=self.model_name,
                 contents=prompt,
             )
             
-            # Parse Gemini response
-            # New API returns response.text directly
-            response_text = response.text if hasattr(response, 'text') else str(response)
-            result = self._parse_gemini_response(response_text)
+            # Stream the response and stop as soon as a complete JSON object has arrived
+            buffer = io.StringIO()
+            result = None
+            async with contextlib.aclosing(stream):
+                async for chunk in stream:
+                    chunk_text = chunk.text or ""
+                    buffer.write(chunk_text)
+                    if "}" in chunk_text:
+                        result = self._parse_streamed_json(buffer.getvalue())
+                        if result is not None:
+                            break
+            
+            # Stream ended without a usable object - parse the full text (raises on bad JSON)
+            if result is None:
+                result = self._parse_gemini_response(buffer.getvalue())
+            if self._resolves(result, platform_ids):
+                self._cache_call(_recommendation_cache.add, fingerprint, result, embedding, scope)
             
-            print(f"✅ Gemini AI analysis complete!")
+            logger.info("[OK] Gemini AI analysis complete")
             return result
             
         except Exception as e:
-            print(f"❌ Gemini API error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ERROR] Gemini API error: %s", e)
             raise
     
+    @staticmethod
+    def _resolves(result: Dict[str, Any], platform_ids: FrozenSet[int]) -> bool:
+        """Whether every platform a recommendation references is still available"""
+        return result.get("recommended_platform_id") in platform_ids and all(
+            rec.get("platform_id") in platform_ids for rec in result.get("all_recommendations", [])
+        )
+    
+    @staticmethod
+    def _cache_call(method, *args) -> Any:
+        """Run a semantic cache operation (None on failure - the cache is best-effort)"""
+        try:
+            return method(*args)
+        except Exception as e:
+            logger.warning("[WARN] Semantic cache %s failed, falling through to Gemini: %s", method.__name__, e)
+            return None
+    
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text for semantic cache lookups (None if embedding fails - cache is best-effort)"""
+        try:
+            response = await self.async_client.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=text,
+            )
+            return list(response.embeddings[0].values)
+        except Exception as e:
+            logger.warning("[WARN] Embedding failed, skipping semantic cache: %s", e)
+            return None
+    
     def _build_context(
         self,
         conversion_goal: ConversionGoal,
@@ -131,31 +299,33 @@ class AIPlatformAnalyzer:
     ) -> Dict[str, Any]:
         """Build comprehensive context dictionary for AI analysis"""
         
-        # Convert locations to dicts if they're Pydantic models
-        target_locations = []
-        if locations:
-            for loc in locations:
-                if isinstance(loc, dict):
-                    target_locations.append(loc.get("name", ""))
-                else:
-                    # Pydantic model - access attribute directly
-                    target_locations.append(getattr(loc, "name", ""))
+        target_locations = _location_names(locations)
+        
+        # Business/brand fields are precomputed on write; rebuild only if the cached copy is stale
+        prompt_cache = business.prompt_context_cache or {}
+        business_fields = prompt_cache.get("business")
+        if not business_fields or business_fields.get("version") != business.updated_at:
+            business_fields = business.build_prompt_context()
         
         context = {
             "campaign_goal": conversion_goal.value,
-            "business_name": business.name,
-            "business_industry": business.industry.value if business.industry else "Unknown",
-            "website_url": str(business.website),
+            "business_id": str(business.id),
+            "business_name": business_fields["business_name"],
+            "business_industry": business_fields["business_industry"],
+            "website_url": business_fields["website_url"],
             "target_locations": target_locations,
         }
         
         # Add brand information
         if brand:
+            brand_fields = prompt_cache.get("brand")
+            if not brand_fields or brand_fields.get("version") != brand.updated_at:
+                brand_fields = brand.build_prompt_context()
             context.update({
-                "brand_description": brand.description,
-                "brand_colors": brand.brand_colors,
-                "brand_tone": brand.tone_of_voice,
-                "brand_language": brand.language,
+                "brand_description": brand_fields["brand_description"],
+                "brand_colors": brand_fields["brand_colors"],
+                "brand_tone": brand_fields["brand_tone"],
+                "brand_language": brand_fields["brand_language"],
             })
         else:
             context.update({
@@ -172,16 +342,27 @@ class AIPlatformAnalyzer:
             total_words = website_content.get("total_words", 0)
             pages = website_content.get("pages", [])
             
-            # Extract detailed content insights
-            total_images = sum(len(page.get("images", [])) for page in pages)
+            # Single pass over pages: image totals, titles/descriptions, video/blog indicators
+            total_images = 0
+            page_titles = []
+            page_descriptions = []
+            has_video = False
+            has_blog = False
+            for i, page in enumerate(pages):
+                total_images += len(page.get("images", ()))
+                if i < 20:
+                    page_titles.append(page.get("title", ""))
+                    page_descriptions.append(page.get("description", ""))
+                if not has_video and _VIDEO_RE.search(page.get("content", "")):
+                    has_video = True
+                if not has_blog and _BLOG_URL_RE.search(page.get("url", "")):
+                    has_blog = True
             avg_images_per_page = total_images / len(pages) if pages else 0
             
-            # Extract page titles and descriptions
-            page_titles = [page.get("title", "") for page in pages[:20]]
-            page_descriptions = [page.get("description", "") for page in pages[:20]]
-            
-            # Get full content from all pages (up to 10000 chars)
-            full_content = aggregated_text[:10000] if len(aggregated_text) > 10000 else aggregated_text
+            # Prompt-sized content is cut once at crawl time (older crawl results: cut here)
+            full_content = website_content.get("aggregated_text_prompt")
+            if full_content is None:
+                full_content = aggregated_text[:AdMasterContentCrawlerService.PROMPT_TEXT_CHARS]
             
             context.update({
                 "website_content_full": full_content,  # Full content for semantic analysis
@@ -194,14 +375,11 @@ class AIPlatformAnalyzer:
                 "page_titles": page_titles,
                 "page_descriptions": page_descriptions,
                 "content_type_indicators": {
-                    "has_ecommerce_keywords": any(
-                        kw in aggregated_text.lower() 
-                        for kw in ["buy", "shop", "cart", "checkout", "product", "price", "add to cart", "purchase"]
-                    ),
+                    "has_ecommerce_keywords": _ECOMMERCE_KEYWORDS_RE.search(aggregated_text) is not None,
                     "is_visual_heavy": avg_images_per_page > 5,
                     "is_text_heavy": total_words > 10000,
-                    "has_video_content": any("video" in page.get("content", "").lower() for page in pages),
-                    "has_blog_content": any("blog" in page.get("url", "").lower() or "article" in page.get("url", "").lower() for page in pages),
+                    "has_video_content": has_video,
+                    "has_blog_content": has_blog,
                 },
             })
         else:
@@ -220,7 +398,28 @@ class AIPlatformAnalyzer:
         
         return context
     
-    async def _get_platforms_info(self) -> List[Dict[str, Any]]:
+    async def _get_cached_platforms(self) -> Tuple[float, List[Dict[str, Any]], str, FrozenSet[int]]:
+        """Return the platforms cache entry, refreshing it from the database once expired"""
+        global _platforms_cache
+        
+        if _platforms_cache and time.monotonic() - _platforms_cache[0] < PLATFORMS_CACHE_TTL_SECONDS:
+            return _platforms_cache
+        
+        # Only one request refreshes an expired cache; the rest wait and reuse it
+        async with _platforms_cache_lock:
+            if _platforms_cache and time.monotonic() - _platforms_cache[0] < PLATFORMS_CACHE_TTL_SECONDS:
+                return _platforms_cache
+            
+            platforms_info = await self._fetch_platforms_info()
+            _platforms_cache = (
+                time.monotonic(),
+                platforms_info,
+                json.dumps(platforms_info, indent=2),
+                frozenset(platform["id"] for platform in platforms_info),
+            )
+            return _platforms_cache
+    
+    async def _fetch_platforms_info(self) -> List[Dict[str, Any]]:
         """Get information about available ad platforms from database"""
         from app.services.platform_service import PlatformService
         
@@ -249,103 +448,10 @@ class AIPlatformAnalyzer:
         
         return platforms_info
     
-    def _get_platforms_info_old(self) -> List[Dict[str, Any]]:
-        """OLD - Get information about available ad platforms (hardcoded) - DEPRECATED"""
-        return [
-            {
-                "id": 0,
-                "name": "Google Ads",
-                "type": "search",
-                "best_for": ["website-traffic", "online-leads", "online-sales"],
-                "description": "Search engine advertising, display ads, shopping ads, video ads",
-                "audience": "Broad, intent-driven users searching for products/services",
-            },
-            {
-                "id": 1,
-                "name": "Facebook Ads",
-                "type": "social",
-                "best_for": ["brand-awareness", "online-leads", "online-sales"],
-                "description": "Social media feed ads, stories, reels, video ads",
-                "audience": "Broad consumer audience, great for B2C",
-            },
-            {
-                "id": 2,
-                "name": "Instagram Ads",
-                "type": "social",
-                "best_for": ["brand-awareness", "online-sales"],
-                "description": "Visual social media ads, stories, reels, shopping",
-                "audience": "Younger demographic, visual content lovers, fashion/beauty/e-commerce",
-            },
-            {
-                "id": 3,
-                "name": "LinkedIn Ads",
-                "type": "social",
-                "best_for": ["online-leads", "brand-awareness"],
-                "description": "Professional network advertising, B2B focused",
-                "audience": "Professionals, B2B decision makers, career-focused",
-            },
-            {
-                "id": 4,
-                "name": "Twitter Ads",
-                "type": "social",
-                "best_for": ["brand-awareness", "online-leads"],
-                "description": "Real-time social media advertising",
-                "audience": "News-aware, tech-savvy, engaged users",
-            },
-            {
-                "id": 8,
-                "name": "YouTube Ads",
-                "type": "video",
-                "best_for": ["brand-awareness", "website-traffic"],
-                "description": "Video advertising on YouTube",
-                "audience": "Video content consumers, broad reach",
-            },
-            {
-                "id": 10,
-                "name": "TikTok Ads",
-                "type": "video",
-                "best_for": ["brand-awareness", "online-sales"],
-                "description": "Short-form video advertising",
-                "audience": "Gen Z, young millennials, creative content",
-            },
-            {
-                "id": 17,
-                "name": "Microsoft Ads",
-                "type": "search",
-                "best_for": ["website-traffic", "online-leads"],
-                "description": "Bing, Yahoo search advertising",
-                "audience": "Older demographic, Windows users, alternative to Google",
-            },
-            {
-                "id": 19,
-                "name": "Google Performance Max",
-                "type": "display",
-                "best_for": ["website-traffic", "online-sales", "online-leads"],
-                "description": "AI-powered campaign across all Google properties",
-                "audience": "Broad reach across Google ecosystem",
-            },
-            {
-                "id": 20,
-                "name": "Online Bannering",
-                "type": "display",
-                "best_for": ["brand-awareness"],
-                "description": "Display banner advertising",
-                "audience": "Broad reach, awareness campaigns",
-            },
-            {
-                "id": 18,
-                "name": "Amazon Ads",
-                "type": "shopping",
-                "best_for": ["online-sales"],
-                "description": "Product advertising on Amazon",
-                "audience": "Amazon shoppers, purchase-ready users",
-            },
-        ]
-    
     def _create_analysis_prompt(
         self,
         context: Dict[str, Any],
-        platforms: List[Dict[str, Any]],
+        platforms_block: str,
         conversion_goal: ConversionGoal,
     ) -> str:
         """Create comprehensive, refined prompt for Gemini AI"""
@@ -357,8 +463,9 @@ class AIPlatformAnalyzer:
             "online-sales": "Drive direct sales and conversions",
         }
         
-        # Build comprehensive prompt
-        prompt = f"""You are an expert digital marketing strategist with deep knowledge of advertising platforms, audience targeting, and campaign optimization. Your task is to analyze a business comprehensively and recommend the best advertising platform(s) using AI-powered semantic understanding.
+        # Build comprehensive prompt from parts (joined once at the end)
+        parts: List[str] = []
+        parts.append(f"""You are an expert digital marketing strategist with deep knowledge of advertising platforms, audience targeting, and campaign optimization. Your task is to analyze a business comprehensively and recommend the best advertising platform(s) using AI-powered semantic understanding.
 
 **CAMPAIGN OBJECTIVE:**
 - Primary Goal: {conversion_goal.value} ({goal_descriptions.get(conversion_goal.value, '')})
@@ -374,12 +481,12 @@ class AIPlatformAnalyzer:
 - Primary Language: {context.get('brand_language', 'en')}
 
 **WEBSITE CONTENT ANALYSIS:**
-"""
+""")
         
         stats = context.get('content_stats', {})
         content_indicators = context.get('content_type_indicators', {})
         
-        prompt += f"""
+        parts.append(f"""
 - Pages Crawled: {stats.get('pages_crawled', 0)} pages
 - Total Content: {stats.get('total_words', 0)} words
 - Visual Content: {stats.get('total_images', 0)} images ({stats.get('avg_images_per_page', 0):.1f} avg per page)
@@ -391,32 +498,32 @@ class AIPlatformAnalyzer:
   * Blog/Article Content: {content_indicators.get('has_blog_content', False)}
 
 **WEBSITE CONTENT (Semantic Analysis):**
-"""
+""")
         
         # Add full website content for semantic understanding
         website_content = context.get('website_content_full', '')
         if website_content and website_content != "Content not crawled":
-            # Limit to 8000 chars to stay within token limits
-            prompt += f"""
-{website_content[:8000]}
+            # Already limited to PROMPT_TEXT_CHARS to stay within token limits
+            parts.append(f"""
+{website_content}
 
 (Content truncated if longer - this represents the semantic understanding of the website)
-"""
+""")
         else:
-            prompt += "\nWebsite content was not crawled or is unavailable.\n"
+            parts.append("\nWebsite content was not crawled or is unavailable.\n")
         
         # Add page structure info
         page_titles = context.get('page_titles', [])
         if page_titles:
-            prompt += f"""
+            parts.append(f"""
 **Page Structure (Top {len(page_titles[:10])} pages):**
 {chr(10).join(f"- {title}" for title in page_titles[:10])}
-"""
+""")
         
-        prompt += f"""
+        parts.append(f"""
 
 **AVAILABLE ADVERTISING PLATFORMS:**
-{json.dumps(platforms, indent=2)}
+{platforms_block}
 
 **YOUR COMPREHENSIVE ANALYSIS TASK:**
 
@@ -470,24 +577,31 @@ Perform a deep semantic analysis considering:
 - Provide at least 5 platform recommendations, ranked by score
 - Be specific and detailed in your reasoning
 - Consider all factors holistically, not just individual metrics
-"""
+""")
         
-        return prompt
+        return "".join(parts)
+    
+    def _parse_streamed_json(self, partial_text: str) -> Optional[Dict[str, Any]]:
+        """Decode the first complete JSON object in a partial response (None if not complete yet)"""
+        start = partial_text.find("{")
+        if start == -1:
+            return None
+        try:
+            result, _ = _JSON_DECODER.raw_decode(partial_text, start)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(result, dict) or "recommended_platform_id" not in result:
+            return None
+        return result
     
     def _parse_gemini_response(self, response_text: str) -> Dict[str, Any]:
         """Parse Gemini's JSON response"""
         try:
             # Remove markdown code blocks if present
-            cleaned = response_text.strip()
-            if cleaned.startswith("```json"):
-                cleaned = cleaned[7:]
-            if cleaned.startswith("```"):
-                cleaned = cleaned[3:]
-            if cleaned.endswith("```"):
-                cleaned = cleaned[:-3]
-            cleaned = cleaned.strip()
+            cleaned = _CODE_FENCE_RE.sub("", response_text.strip())
             
-            result = json.loads(cleaned)
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            result = orjson.loads(cleaned)
             
             # Validate structure
             if "recommended_platform_id" not in result:
@@ -496,7 +610,7 @@ Perform a deep semantic analysis considering:
             return result
             
         except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse Gemini JSON response: {e}")
-            print(f"Response was: {response_text[:500]}")
+            logger.error("[ERROR] Failed to parse Gemini JSON response: %s", e)
+            logger.error("Response was: %s", response_text[:500])
             raise ValueError(f"Invalid JSON response from Gemini: {e}")
 
@@ -4,11 +4,36 @@ Brand service - Business logic for brand operations
 from typing import Optional
 from datetime import datetime
 
+from async_lru import alru_cache
+from beanie import PydanticObjectId
+
 from app.models.brand import Brand
 from app.models.business import Business
 from app.schemas.brand import BrandCreate, BrandUpdate
 
 
+class _BrandNotFound(Exception):
+    """Raised by _load_brand so a missing brand is never cached (async-lru skips exceptions)"""
+
+
+@alru_cache(maxsize=1024, ttl=30)
+async def _load_brand(business_id: str) -> Brand:
+    """Brand lookup shared across a request flow (invalidated on brand writes)"""
+    brand = await Brand.find_one(Brand.business_id == business_id)
+    if brand is None:
+        raise _BrandNotFound(business_id)
+    return brand
+
+
+async def _find_brand(business_id: str) -> Optional[Brand]:
+    """Cached brand lookup - each caller gets its own copy, never the shared cached document"""
+    try:
+        brand = await _load_brand(business_id)
+    except _BrandNotFound:
+        return None
+    return brand.model_copy(deep=True)
+
+
 class BrandService:
     """Service class for brand operations"""
     
@@ -17,7 +42,7 @@ class BrandService:
         """
         Get existing brand for a business, or create a new one
         """
-        brand = await Brand.find_one(Brand.business_id == business_id)
+        brand = await _find_brand(business_id)
         if not brand:
             brand = Brand(
                 business_id=business_id,
@@ -28,7 +53,7 @@ class BrandService:
     @staticmethod
     async def get_brand_by_business_id(business_id: str) -> Optional[Brand]:
         """Get brand by business ID"""
-        return await Brand.find_one(Brand.business_id == business_id)
+        return await _find_brand(business_id)
     
     @staticmethod
     async def create_or_update_brand(
@@ -42,7 +67,12 @@ class BrandService:
         
         # Update brand with provided data
         update_data = brand_data.model_dump(exclude_unset=True)
+        # Invalidate on both sides of the write - a read racing the write can't keep stale data cached
+        _load_brand.cache_invalidate(business_id)
         await brand.update_brand_info(**update_data)
+        _load_brand.cache_invalidate(business_id)
+        
+        await BrandService._refresh_prompt_context(business_id, brand)
         
         return brand
     
@@ -51,6 +81,16 @@ class BrandService:
         """Mark brand as complete (user has reviewed)"""
         brand = await BrandService.get_brand_by_business_id(business_id)
         if brand:
+            _load_brand.cache_invalidate(business_id)
             await brand.update_brand_info(is_complete=True)
+            _load_brand.cache_invalidate(business_id)
+            await BrandService._refresh_prompt_context(business_id, brand)
         return brand
+    
+    @staticmethod
+    async def _refresh_prompt_context(business_id: str, brand: Brand) -> None:
+        """Store the brand's prompt-ready fields on its business (Business.prompt_context_cache)"""
+        await Business.find_one({"_id": PydanticObjectId(business_id)}).update(
+            {"$set": {"prompt_context_cache.brand": brand.build_prompt_context()}}
+        )
 
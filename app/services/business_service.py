@@ -2,7 +2,13 @@
 Business service - Business logic for business operations
 """
 from typing import List, Optional
-from datetime import datetime
+
+from async_lru import alru_cache
+from beanie import PydanticObjectId
+from bson import ObjectId
+from bson.errors import InvalidId
+from pydantic import BaseModel, Field
+from pymongo import ReturnDocument
 
 from app.models.business import Business, BusinessStatus
 from app.models.user import User
@@ -10,6 +16,35 @@ from app.schemas.business import BusinessCreate, BusinessUpdate
 from app.services.user_service import UserService
 
 
+class _BusinessIdProjection(BaseModel):
+    """Projection that fetches only the document _id (existence checks)"""
+    id: PydanticObjectId = Field(alias="_id")
+
+
+class _BusinessNotFound(Exception):
+    """Raised by _load_user_business so a miss is never cached (async-lru skips exceptions)"""
+
+
+@alru_cache(maxsize=1024, ttl=30)
+async def _load_user_business(business_id: str, user_id: str) -> Business:
+    """Owned-business lookup shared across a request flow (invalidated on business writes)"""
+    business = await Business.get(business_id)
+    
+    if business and business.user_id == user_id:
+        return business
+    
+    raise _BusinessNotFound(business_id)
+
+
+async def _find_user_business(business_id: str, user_id: str) -> Optional[Business]:
+    """Cached owned-business lookup - each caller gets its own copy of the cached document"""
+    try:
+        business = await _load_user_business(business_id, user_id)
+    except _BusinessNotFound:
+        return None
+    return business.model_copy(deep=True)
+
+
 class BusinessService:
     """Service class for business operations"""
     
@@ -23,6 +58,7 @@ class BusinessService:
             user_id=user_id,
             **business_data.model_dump()
         )
+        business.prompt_context_cache = {"business": business.build_prompt_context()}
         await business.insert()
         
         # Add business to user's businesses list
@@ -35,12 +71,7 @@ class BusinessService:
     @staticmethod
     async def get_business_by_id(business_id: str, user_id: str) -> Optional[Business]:
         """Get business by ID (only if it belongs to the user)"""
-        business = await Business.get(business_id)
-        
-        if business and business.user_id == user_id:
-            return business
-        
-        return None
+        return await _find_user_business(business_id, user_id)
     
     @staticmethod
     async def get_user_businesses(
@@ -65,21 +96,42 @@ class BusinessService:
         user_id: str,
         business_data: BusinessUpdate
     ) -> Optional[Business]:
-        """Update business information"""
-        business = await BusinessService.get_business_by_id(business_id, user_id)
-        
-        if not business:
+        """Update business information (single atomic update, scoped to the owner)"""
+        try:
+            obj_id = ObjectId(business_id)
+        except (InvalidId, TypeError):
             return None
         
-        # Update only provided fields
-        update_data = business_data.model_dump(exclude_unset=True)
-        update_data["updated_at"] = datetime.utcnow()
+        # Update only provided fields ($literal keeps values like "$x" from being read as field paths)
+        update_data = business_data.model_dump(mode="json", exclude_unset=True)
         
-        for field, value in update_data.items():
-            setattr(business, field, value)
+        # Pipeline update so prompt_context_cache.business (see Business.build_prompt_context)
+        # is rebuilt from the merged document in the same round-trip. updated_at is stamped
+        # server-side ($$NOW) and copied as the cache version.
+        pipeline = [
+            {"$set": {
+                **{field: {"$literal": value} for field, value in update_data.items()},
+                "updated_at": "$$NOW",
+            }},
+            {"$set": {
+                "prompt_context_cache.business": {
+                    "version": "$updated_at",
+                    "business_name": "$name",
+                    "business_industry": {"$ifNull": ["$industry", "Unknown"]},
+                    "website_url": "$website",
+                },
+            }},
+        ]
+        # Invalidate on both sides of the write - a read racing the write can't keep stale data cached
+        _load_user_business.cache_invalidate(business_id, user_id)
+        document = await Business.get_motor_collection().find_one_and_update(
+            {"_id": obj_id, "user_id": user_id},
+            pipeline,
+            return_document=ReturnDocument.AFTER,
+        )
+        _load_user_business.cache_invalidate(business_id, user_id)
         
-        await business.save()
-        return business
+        return Business.model_validate(document) if document else None
     
     @staticmethod
     async def delete_business(business_id: str, user_id: str) -> bool:
@@ -95,12 +147,17 @@ class BusinessService:
             await user.remove_business(str(business.id))
         
         # Delete business
+        _load_user_business.cache_invalidate(business_id, user_id)
         await business.delete()
+        _load_user_business.cache_invalidate(business_id, user_id)
         return True
     
     @staticmethod
     async def has_any_business(user_id: str) -> bool:
         """Check if user has any business"""
-        count = await Business.find(Business.user_id == user_id).count()
-        return count > 0
+        business = await Business.find_one(
+            Business.user_id == user_id,
+            projection_model=_BusinessIdProjection,
+        )
+        return business is not None
 
@@ -0,0 +1,114 @@
+"""
+Campaign insert batcher - Coalesces concurrent campaign inserts into one insert_many
+Requests enqueue their campaign and await a future; a background worker drains the queue
+every CAMPAIGN_INSERT_BATCH_WINDOW_MS (or once CAMPAIGN_INSERT_BATCH_SIZE are pending)
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from app.core.config import settings
+from app.models.campaign import Campaign
+
+logger = logging.getLogger(__name__)
+
+
+class CampaignInsertBatcher:
+    """Background worker that writes queued campaigns with Campaign.insert_many"""
+
+    queue: Optional[asyncio.Queue] = None
+    worker: Optional[asyncio.Task] = None
+
+    @classmethod
+    def start(cls):
+        """Start the batching worker (no-op when CAMPAIGN_INSERT_BATCHING is disabled)"""
+        if not settings.CAMPAIGN_INSERT_BATCHING or cls.worker is not None:
+            return
+        cls.queue = asyncio.Queue()
+        cls.worker = asyncio.create_task(cls._run())
+        logger.info("[OK] Campaign insert batching started")
+
+    @classmethod
+    async def stop(cls):
+        """Flush pending inserts and stop the worker"""
+        if cls.worker is None:
+            return
+        worker, cls.worker = cls.worker, None
+        await cls.queue.join()
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+        cls.queue = None
+
+    @classmethod
+    async def insert(cls, campaign: Campaign) -> Campaign:
+        """Insert a campaign - batched when the worker is running, directly otherwise"""
+        if cls.worker is None or cls.worker.done():
+            await campaign.insert()
+            return campaign
+
+        # Assign the id up front so the caller gets it back regardless of batch position
+        if campaign.id is None:
+            campaign.id = PydanticObjectId()
+        future = asyncio.get_running_loop().create_future()
+        await cls.queue.put((campaign, future))
+        try:
+            await asyncio.wait_for(future, settings.CAMPAIGN_INSERT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Worker died or stalled - insert directly; the preassigned id makes this safe
+            # if the batch did write the campaign after all
+            logger.warning("[WARN] Batched insert of campaign %s timed out, inserting directly", campaign.id)
+            try:
+                await campaign.insert()
+            except DuplicateKeyError:
+                if await Campaign.get(campaign.id) is None:
+                    raise
+        return campaign
+
+    @classmethod
+    async def _run(cls):
+        """Drain the queue in batches until cancelled"""
+        window = settings.CAMPAIGN_INSERT_BATCH_WINDOW_MS / 1000
+        while True:
+            batch = [await cls.queue.get()]
+            deadline = asyncio.get_running_loop().time() + window
+            while len(batch) < settings.CAMPAIGN_INSERT_BATCH_SIZE:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(cls.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await cls._write(batch)
+            finally:
+                for _ in batch:
+                    cls.queue.task_done()
+
+    @staticmethod
+    async def _write(batch: List[Tuple[Campaign, asyncio.Future]]):
+        """Insert one batch and resolve each caller's future"""
+        failed = {}
+        try:
+            await Campaign.insert_many([campaign for campaign, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            # Unordered insert - only the documents listed in writeErrors were rejected
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = e
+        except Exception as e:
+            failed = {i: e for i in range(len(batch))}
+
+        for i, (_, future) in enumerate(batch):
+            if future.done():  # Caller was cancelled while waiting
+                continue
+            if i in failed:
+                future.set_exception(failed[i])
+            else:
+                future.set_result(None)
@@ -2,20 +2,52 @@
 Campaign service - Handles campaign operations
 """
 import os
-from typing import List, Optional
+import re
+import logging
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 import asyncio
+from bson import ObjectId
+from pymongo import DESCENDING
 
 from app.models.campaign import Campaign, ConversionGoal, ConversionGoalIcon, BiddingStrategyType, CampaignStatus
 from app.models.business import Business
-from app.schemas.campaign import CampaignCreate, LocationAreaSchema, DemographicsLanguageSchema
-from app.services.platform_service import PlatformService
+from app.schemas.campaign import CampaignCreate
 from app.services.platform_intelligence_service import PlatformIntelligenceService
 from app.services.brand_service import BrandService
+from app.services.campaign_insert_batcher import CampaignInsertBatcher
 from app.core.config import settings
 from app.core.constants import DEFAULT_CURRENCY as CONSTANT_DEFAULT_CURRENCY, DEFAULT_DAILY_BUDGET as CONSTANT_DEFAULT_DAILY_BUDGET
 from app.core.exceptions import NotFoundError, ValidationError, InternalServerError
 
+logger = logging.getLogger(__name__)
+
+# Resolved once at import (.env is loaded before services are imported)
+_MODEL_NAME = os.getenv("GEMINI_MODEL") or os.getenv("DEFAULT_MODEL")
+
+# Well-formed ObjectId hex string - checked before constructing ObjectId
+_OID_RE = re.compile(r"^[0-9a-fA-F]{24}\Z")
+
+# User campaign listing order - _id breaks created_at ties so page cursors are exact
+_NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# Frontend advertising goal -> conversion goal
+_GOAL_MAP = MappingProxyType({
+    "website-traffic": ConversionGoal.WEBSITE_TRAFFIC,
+    "brand-awareness": ConversionGoal.BRAND_AWARENESS,
+    "online-leads": ConversionGoal.ONLINE_LEADS,
+    "online-sales": ConversionGoal.ONLINE_SALES,
+})
+
+# Conversion goal -> icon
+_ICON_MAP = MappingProxyType({
+    ConversionGoal.WEBSITE_TRAFFIC: ConversionGoalIcon.WEBSITE_TRAFFIC,
+    ConversionGoal.BRAND_AWARENESS: ConversionGoalIcon.BRAND_AWARENESS,
+    ConversionGoal.ONLINE_LEADS: ConversionGoalIcon.ONLINE_LEADS,
+    ConversionGoal.ONLINE_SALES: ConversionGoalIcon.ONLINE_SALES,
+})
+
 
 class CampaignService:
     """Service for campaign operations"""
@@ -23,28 +55,18 @@ class CampaignService:
     @staticmethod
     def _map_advertising_goal_to_conversion_goal(advertising_goal: str) -> ConversionGoal:
         """Map frontend advertising goal to conversion goal"""
-        mapping = {
-            "website-traffic": ConversionGoal.WEBSITE_TRAFFIC,
-            "brand-awareness": ConversionGoal.BRAND_AWARENESS,
-            "online-leads": ConversionGoal.ONLINE_LEADS,
-            "online-sales": ConversionGoal.ONLINE_SALES,
-        }
-        if advertising_goal not in mapping:
+        conversion_goal = _GOAL_MAP.get(advertising_goal)
+        if conversion_goal is None:
             raise ValidationError(f"Invalid advertising goal: {advertising_goal}")
-        return mapping[advertising_goal]
+        return conversion_goal
 
     @staticmethod
     def _get_conversion_goal_icon(conversion_goal: ConversionGoal) -> ConversionGoalIcon:
         """Get icon for conversion goal"""
-        mapping = {
-            ConversionGoal.WEBSITE_TRAFFIC: ConversionGoalIcon.WEBSITE_TRAFFIC,
-            ConversionGoal.BRAND_AWARENESS: ConversionGoalIcon.BRAND_AWARENESS,
-            ConversionGoal.ONLINE_LEADS: ConversionGoalIcon.ONLINE_LEADS,
-            ConversionGoal.ONLINE_SALES: ConversionGoalIcon.ONLINE_SALES,
-        }
-        if conversion_goal not in mapping:
+        icon = _ICON_MAP.get(conversion_goal)
+        if icon is None:
             raise ValidationError(f"Invalid conversion goal: {conversion_goal}")
-        return mapping[conversion_goal]
+        return icon
 
     @staticmethod
     async def create_campaign(
@@ -53,8 +75,13 @@ class CampaignService:
     ) -> Campaign:
         """Create a new campaign"""
         
-        # Get business to extract industry
-        business = await Business.get(campaign_data.business_id)
+        # Business (for industry) and brand (for intelligence analysis) are independent reads.
+        # Safe to gather: each Beanie/Motor call checks out its own pooled connection - do not
+        # pass a shared ClientSession to gathered calls (a session is not concurrency-safe)
+        business, brand = await asyncio.gather(
+            Business.get(campaign_data.business_id),
+            BrandService.get_brand_by_business_id(campaign_data.business_id),
+        )
         if not business:
             raise NotFoundError("Business", campaign_data.business_id)
         
@@ -70,32 +97,30 @@ class CampaignService:
         
         conversion_goal_icon = CampaignService._get_conversion_goal_icon(conversion_goal)
         
-        # Get brand data for intelligence analysis
-        print(f"📋 Campaign Creation Flow:")
-        print(f"   Goal: {conversion_goal.value}")
-        print(f"   Business: {business.name} ({business.industry.value if business.industry else 'No industry'})")
-        print(f"   Campaign URL: {campaign_data.url}")
-        print(f"   Business Website: {business.website}")
-        
-        brand = await BrandService.get_brand_by_business_id(campaign_data.business_id)
-        if brand:
-            print(f"   Brand found: {brand.description[:50]}...")
-        else:
-            print(f"   ⚠️  No brand data found (crawler may not have run)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[CAMPAIGN] Campaign Creation Flow: goal=%s business=%s (%s) campaign_url=%s website=%s",
+                conversion_goal.value,
+                business.name,
+                business.industry.value if business.industry else "No industry",
+                campaign_data.url,
+                business.website,
+            )
+            if brand:
+                logger.debug("   Brand found: %s...", brand.description[:50])
+            else:
+                logger.debug("   [WARN] No brand data found (crawler may not have run)")
         
         # Get platform recommendations using AI intelligence service
         # No fallbacks - must use AI
         # Model name from GEMINI_MODEL or DEFAULT_MODEL environment variable (no fallback)
-        model_name = os.getenv("GEMINI_MODEL")
-        if not model_name:
-            model_name = os.getenv("DEFAULT_MODEL")
-        if not model_name:
+        if not _MODEL_NAME:
             raise InternalServerError(
                 "GEMINI_MODEL or DEFAULT_MODEL environment variable is required. Please add it to your .env file.",
                 details={"missing_env_vars": ["GEMINI_MODEL", "DEFAULT_MODEL"]}
             )
         
-        print(f"\n🚀 Starting Intelligence Service (with {model_name} AI)...")
+        logger.debug("[AI] Starting Intelligence Service (with %s AI)...", _MODEL_NAME)
         recommendation_result = await PlatformIntelligenceService.get_best_platform_with_analysis(
             conversion_goal=conversion_goal,
             business=business,
@@ -107,34 +132,25 @@ class CampaignService:
             raise InternalServerError("AI platform recommendation failed - no result returned")
         
         recommended_platform = recommendation_result["platform"]
-        print(f"✅ Intelligence Service Success!")
-        print(f"   Recommended: {recommended_platform.name} (ID: {recommended_platform.platform_id})")
+        logger.debug(
+            "[OK] Intelligence Service Success! Recommended: %s (ID: %s)",
+            recommended_platform.name,
+            recommended_platform.platform_id,
+        )
         
         # Extract platform IDs from recommendations
         all_recommended_platform_ids = [
             rec["platform_id"] for rec in recommendation_result["all_recommendations"]
         ]
-        print(f"   Supported platforms: {all_recommended_platform_ids}")
-        
-        # Fetch platform objects by IDs
-        all_recommended_platforms = await PlatformService.get_platforms_by_ids(
-            all_recommended_platform_ids
-        )
-        print(f"   Fetched {len(all_recommended_platforms)} platform objects")
+        logger.debug("   Supported platforms: %s", all_recommended_platform_ids)
         
         # Build demographics - no defaults, must be provided
-        demographics_languages = [
-            DemographicsLanguageSchema(
-                id=campaign_data.language,
-                text=campaign_data.language.upper(),
-                iso=campaign_data.language,
-            ).model_dump()
-        ]
+        # (DemographicsLanguageSchema shape, built directly - the values are already validated strings)
+        language = campaign_data.language
+        demographics_languages = [{"id": language, "text": language.upper(), "iso": language}]
         
-        demographics_location_areas = [
-            loc.model_dump() if isinstance(loc, LocationAreaSchema) else loc
-            for loc in campaign_data.locations
-        ]
+        # CampaignCreate validates locations into LocationAreaSchema
+        demographics_location_areas = [loc.model_dump(mode="python") for loc in campaign_data.locations]
         
         # Create campaign
         # Convert HttpUrl to string for MongoDB storage
@@ -161,44 +177,35 @@ class CampaignService:
                 }
             ],
             recommended_platform_id=recommended_platform.platform_id if recommended_platform else None,
-            supported_platform_ids=[p.platform_id for p in all_recommended_platforms],
+            supported_platform_ids=all_recommended_platform_ids,
             demographics_languages=demographics_languages,
             demographics_location_areas=demographics_location_areas,
             website_industry=business.industry.value if business.industry else None,
             status=CampaignStatus.DRAFT,
         )
         
-        print(f"\n📝 Campaign Created:")
-        print(f"   Recommended Platform ID: {recommended_platform.platform_id if recommended_platform else None}")
-        print(f"   Supported Platform IDs: {[p.platform_id for p in all_recommended_platforms]}")
-        print(f"   ==========================================\n")
+        logger.debug(
+            "[CAMPAIGN] Campaign Created: recommended_platform_id=%s supported_platform_ids=%s",
+            campaign.recommended_platform_id,
+            campaign.supported_platform_ids,
+        )
         
-        await campaign.insert()
-        return campaign
+        return await CampaignInsertBatcher.insert(campaign)
 
     @staticmethod
     async def get_campaign_by_id(campaign_id: str, user_id: str) -> Optional[Campaign]:
         """Get campaign by ID (with user check)"""
-        from bson import ObjectId
-        from bson.errors import InvalidId
-        
         # Convert campaign_id to ObjectId
-        try:
-            obj_id = ObjectId(campaign_id)
-        except (InvalidId, ValueError):
-            print(f"❌ Invalid campaign ID format: {campaign_id}")
+        if not _OID_RE.match(campaign_id):
+            logger.debug("[ERROR] Invalid campaign ID format: %s", campaign_id)
             return None
+        obj_id = ObjectId(campaign_id)
         
-        # Query campaign by ID
-        campaign = await Campaign.find_one({"_id": obj_id})
+        # Ownership is part of the filter - other users' campaigns never leave the database
+        campaign = await Campaign.find_one({"_id": obj_id, "user_id": user_id})
         
         if not campaign:
-            print(f"⚠️  Campaign {campaign_id} not found in database")
-            return None
-        
-        # Verify it belongs to the user
-        if campaign.user_id != user_id:
-            print(f"⚠️  Campaign {campaign_id} found but user_id mismatch: campaign.user_id={campaign.user_id}, requested={user_id}")
+            logger.debug("[WARN] Campaign %s not found for user %s", campaign_id, user_id)
             return None
         
         return campaign
@@ -212,9 +219,69 @@ class CampaignService:
         ).to_list()
 
     @staticmethod
-    async def get_all_user_campaigns(user_id: str) -> List[Campaign]:
-        """Get all campaigns for a user"""
-        return await Campaign.find(
-            Campaign.user_id == user_id,
-        ).sort(-Campaign.created_at).to_list()
+    async def get_all_user_campaigns(
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[Tuple[datetime, ObjectId]] = None,
+    ) -> Tuple[List[Campaign], bool]:
+        """
+        Get a page of campaigns for a user, newest first (ties on created_at broken by _id)
+        
+        Args:
+            user_id: Clerk user ID
+            limit: Maximum number of campaigns to return
+            cursor: (created_at, _id) of the last campaign on the previous page (None for the first page)
+        
+        Returns:
+            (campaigns, whether another page follows)
+        """
+        query = {"user_id": user_id}
+        if cursor is not None:
+            created_at, campaign_id = cursor
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": campaign_id}},
+            ]
+        # One extra row tells whether another page exists
+        campaigns = await Campaign.find(query).sort(_NEWEST_FIRST).limit(limit + 1).to_list()
+        return campaigns[:limit], len(campaigns) > limit
+
+    @staticmethod
+    async def get_user_campaign_totals(user_id: str) -> Dict[str, Any]:
+        """
+        Sum metrics and daily budgets over every campaign of a user (one aggregation)
+        
+        Returns:
+            {"impressions", "clicks", "cost", "conversions", "daily_budget"} - zeros when the user has none
+        """
+        pipeline = [
+            {"$group": {
+                "_id": None,
+                "impressions": {"$sum": {"$sum": "$metrics.impressions"}},
+                "clicks": {"$sum": {"$sum": "$metrics.clicks"}},
+                # cost may be stored as a string - convert like float() would
+                "cost": {"$sum": {"$sum": {"$map": {
+                    "input": {"$ifNull": ["$metrics", []]},
+                    "as": "metric",
+                    "in": {"$convert": {"input": "$$metric.cost", "to": "double", "onError": 0, "onNull": 0}},
+                }}}},
+                "conversions": {"$sum": {"$sum": "$metrics.conversions"}},
+                "daily_budget": {"$sum": "$daily_budget"},
+            }},
+        ]
+        results = await Campaign.find(Campaign.user_id == user_id).aggregate(pipeline).to_list()
+        totals = results[0] if results else {}
+        return {
+            "impressions": totals.get("impressions", 0),
+            "clicks": totals.get("clicks", 0),
+            "cost": float(totals.get("cost", 0.0)),
+            "conversions": totals.get("conversions", 0),
+            "daily_budget": float(totals.get("daily_budget", 0.0)),
+        }
+
+    @staticmethod
+    async def get_all_user_campaigns_stream(user_id: str) -> AsyncIterator[Campaign]:
+        """Yield every campaign for a user, newest first, without materializing the cursor"""
+        async for campaign in Campaign.find(Campaign.user_id == user_id).sort(_NEWEST_FIRST):
+            yield campaign
 
@@ -5,6 +5,7 @@ Completely AI-driven - no rule-based scoring, no fallbacks
 Model name from GEMINI_MODEL or DEFAULT_MODEL environment variable
 """
 import os
+import logging
 from typing import List, Optional, Dict, Any
 from app.models.platform import Platform
 from app.models.campaign import ConversionGoal
@@ -13,6 +14,8 @@ from app.models.business import Business
 from app.services.platform_service import PlatformService
 from app.services.admaster_content_crawler_service import AdMasterContentCrawlerService
 
+logger = logging.getLogger(__name__)
+
 # Import Gemini AI analyzer (required)
 # Check if google-genai package can be imported (lazy check - API key checked when used)
 try:
@@ -21,7 +24,23 @@ try:
     GEMINI_AVAILABLE = True
 except (ImportError, Exception) as e:
     GEMINI_AVAILABLE = False
-    print(f"❌ ERROR: Gemini AI package not available - {str(e)}")
+    logger.error("[ERROR] Gemini AI package not available - %s", e)
+
+# Resolved once at import (.env is loaded before services are imported)
+_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+_MODEL_NAME = os.getenv("GEMINI_MODEL") or os.getenv("DEFAULT_MODEL")
+
+# Shared analyzer so the Gemini client (HTTP connection pool, auth state) is reused across requests
+_ai_analyzer: Optional["AIPlatformAnalyzer"] = None
+
+
+def _get_analyzer() -> "AIPlatformAnalyzer":
+    """Return the process-wide AIPlatformAnalyzer, creating it on first use"""
+    global _ai_analyzer
+    # Construction is synchronous, so no other coroutine can interleave here - no lock needed
+    if _ai_analyzer is None:
+        _ai_analyzer = AIPlatformAnalyzer()
+    return _ai_analyzer
 
 
 class PlatformIntelligenceService:
@@ -36,7 +55,7 @@ class PlatformIntelligenceService:
     async def get_best_platform_with_analysis(
         conversion_goal: ConversionGoal,
         business: Business,
-        brand: Optional[Brand] = None,
+        brand: Optional[Brand] = None,  # Caller-resolved; not re-fetched here
         locations: Optional[List[Any]] = None,  # Can be List[Dict] or List[Pydantic models]
     ) -> Optional[Dict[str, Any]]:
         """
@@ -66,27 +85,21 @@ class PlatformIntelligenceService:
             raise ValueError("Gemini AI package is not installed. Please install google-genai package.")
         
         # Check if API key is available (lazy check)
-        api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        if not _API_KEY:
             raise ValueError("GOOGLE_API_KEY or GEMINI_API_KEY environment variable is required. Please add it to your .env file.")
         
-        # 1. Get brand data if available
-        if not brand:
-            from app.services.brand_service import BrandService
-            business_id = str(business.id) if hasattr(business, 'id') else str(business._id)
-            brand = await BrandService.get_brand_by_business_id(business_id)
+        # 1. Brand data is resolved by the caller (None means the business has no brand yet)
 
         # 2. Crawl website content (optional - only if needed)
         # Content crawler is NOT run automatically - it should be triggered separately if needed
         website_content = None
 
         # 3. Use Gemini AI for intelligent analysis (no fallbacks, no defaults)
-        model_name = os.getenv("GEMINI_MODEL") or os.getenv("DEFAULT_MODEL")
-        if not model_name:
+        if not _MODEL_NAME:
             raise ValueError("GEMINI_MODEL or DEFAULT_MODEL environment variable is required. Please add it to your .env file.")
         
-        print(f"🤖 Using {model_name} for AI-powered platform recommendation...")
-        ai_analyzer = AIPlatformAnalyzer()
+        logger.debug("[AI] Using %s for AI-powered platform recommendation...", _MODEL_NAME)
+        ai_analyzer = _get_analyzer()
         ai_result = await ai_analyzer.analyze_and_recommend(
             conversion_goal=conversion_goal,
             business=business,
@@ -95,29 +108,28 @@ class PlatformIntelligenceService:
             locations=locations,
         )
         
-        print(f"✅ Gemini AI recommended: {ai_result['recommended_platform_name']}")
-        print(f"📊 AI Reasoning: {ai_result.get('ai_reasoning', 'N/A')[:200]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[OK] Gemini AI recommended: %s", ai_result["recommended_platform_name"])
+            logger.debug("[AI] Reasoning: %s...", ai_result.get("ai_reasoning", "N/A")[:200])
         
         # Convert AI result to platform objects
-        from app.services.platform_service import PlatformService
-        
-        recommended_platform = await PlatformService.get_platform_by_id(
-            ai_result["recommended_platform_id"]
-        )
+        # One $in query covers the recommended platform and every other recommendation
+        recommendations_by_id = {rec["platform_id"]: rec for rec in ai_result["all_recommendations"]}
+        recommended_id = ai_result["recommended_platform_id"]
+        platform_ids = list(recommendations_by_id)
+        if recommended_id not in recommendations_by_id:
+            platform_ids.append(recommended_id)
+        platforms_by_id = {
+            platform.platform_id: platform
+            for platform in await PlatformService.get_platforms_by_ids(platform_ids)
+        }
         
+        recommended_platform = platforms_by_id.get(recommended_id)
         if not recommended_platform:
-            raise ValueError(f"AI recommended platform ID {ai_result['recommended_platform_id']} not found in database")
-        
-        # Get all recommended platforms
-        all_platform_ids = [rec["platform_id"] for rec in ai_result["all_recommendations"]]
-        all_platforms = await PlatformService.get_platforms_by_ids(all_platform_ids)
+            raise ValueError(f"AI recommended platform ID {recommended_id} not found in database")
         
         # Find the recommended platform's score and details
-        recommended_rec = next(
-            (r for r in ai_result["all_recommendations"] 
-             if r["platform_id"] == recommended_platform.platform_id),
-            None
-        )
+        recommended_rec = recommendations_by_id.get(recommended_id)
         
         if not recommended_rec:
             raise ValueError("Recommended platform not found in AI recommendations")
@@ -2,9 +2,26 @@
 Platform service - Handles platform operations and recommendations
 """
 from typing import List, Optional
+from cachetools import TTLCache
 from app.models.platform import Platform
 from app.models.campaign import ConversionGoal
 
+# Platforms are reference data that only change via the seed scripts - memoize by platform_id
+PLATFORM_CACHE_TTL_SECONDS = 300
+_platform_cache: TTLCache = TTLCache(maxsize=256, ttl=PLATFORM_CACHE_TTL_SECONDS)
+
+# Default platform filters per goal, used when no platform lists the goal in best_for_goals
+_FALLBACK_GOAL_FILTERS = {
+    # Search platforms for traffic
+    ConversionGoal.WEBSITE_TRAFFIC: {"supports_search": True},
+    # Social platforms for awareness
+    ConversionGoal.BRAND_AWARENESS: {"type": "social"},
+    # Search + Social for leads
+    ConversionGoal.ONLINE_LEADS: {"$or": [{"supports_search": True}, {"type": "social"}]},
+    # Shopping + Social for sales
+    ConversionGoal.ONLINE_SALES: {"$or": [{"supports_shopping": True}, {"type": "social"}]},
+}
+
 
 class PlatformService:
     """Service for platform operations"""
@@ -16,14 +33,41 @@ class PlatformService:
 
     @staticmethod
     async def get_platform_by_id(platform_id: int) -> Optional[Platform]:
-        """Get platform by ID"""
-        return await Platform.find_one(Platform.platform_id == platform_id)
+        """Get platform by ID (cached for PLATFORM_CACHE_TTL_SECONDS)"""
+        platform = _platform_cache.get(platform_id)
+        if platform is None:
+            platform = await Platform.find_one(Platform.platform_id == platform_id)
+            if platform:
+                _platform_cache[platform_id] = platform
+        return platform
 
     @staticmethod
     async def get_platforms_by_ids(platform_ids: List[int]) -> List[Platform]:
-        """Get platforms by list of IDs"""
-        # Beanie query: use $in operator for MongoDB
-        return await Platform.find({"platform_id": {"$in": platform_ids}}).to_list()
+        """Get platforms by list of IDs (cached; only misses are queried)"""
+        found = {}
+        misses = []
+        for platform_id in dict.fromkeys(platform_ids):
+            platform = _platform_cache.get(platform_id)
+            if platform is None:
+                misses.append(platform_id)
+            else:
+                found[platform_id] = platform
+        
+        if misses:
+            # Beanie query: use $in operator for MongoDB
+            for platform in await Platform.find({"platform_id": {"$in": misses}}).to_list():
+                _platform_cache[platform.platform_id] = platform
+                found[platform.platform_id] = platform
+        
+        return [found[platform_id] for platform_id in dict.fromkeys(platform_ids) if platform_id in found]
+
+    @staticmethod
+    def invalidate(platform_id: Optional[int] = None) -> None:
+        """Drop a cached platform (or every cached platform) after it is modified"""
+        if platform_id is None:
+            _platform_cache.clear()
+        else:
+            _platform_cache.pop(platform_id, None)
 
     @staticmethod
     async def recommend_platforms(
@@ -41,42 +85,31 @@ class PlatformService:
         - Online Leads: Google Ads, LinkedIn, Facebook
         - Online Sales: Google Shopping, Facebook, Instagram
         """
-        all_platforms = await PlatformService.get_all_platforms()
+        # Budget and currency are hard constraints - evaluated by MongoDB
+        constraints = [
+            {"is_active": True},
+            {"$or": [{"currency_support": currency}, {"currency_support": {"$size": 0}}]},
+        ]
+        if budget:
+            constraints.append({"$or": [{"min_budget": None}, {"min_budget": {"$lte": budget}}]})
         
         # Filter by goal
-        recommended = []
-        for platform in all_platforms:
-            if conversion_goal.value in platform.best_for_goals:
-                recommended.append(platform)
+        recommended = await Platform.find(
+            {"$and": constraints + [{"best_for_goals": conversion_goal.value}]}
+        ).to_list()
         
         # If no specific matches, use default logic
         if not recommended:
-            if conversion_goal == ConversionGoal.WEBSITE_TRAFFIC:
-                # Search platforms for traffic
-                recommended = [p for p in all_platforms if p.supports_search]
-            elif conversion_goal == ConversionGoal.BRAND_AWARENESS:
-                # Social platforms for awareness
-                recommended = [p for p in all_platforms if p.type.value == "social"]
-            elif conversion_goal == ConversionGoal.ONLINE_LEADS:
-                # Search + Social for leads
-                recommended = [p for p in all_platforms if p.supports_search or p.type.value == "social"]
-            elif conversion_goal == ConversionGoal.ONLINE_SALES:
-                # Shopping + Social for sales
-                recommended = [p for p in all_platforms if p.supports_shopping or p.type.value == "social"]
+            goal_filter = _FALLBACK_GOAL_FILTERS.get(conversion_goal)
+            if goal_filter:
+                recommended = await Platform.find({"$and": constraints + [goal_filter]}).to_list()
         
-        # Filter by industry if provided
+        # Prefer platforms for the industry if provided (goal matches are a handful of documents)
         if industry:
             industry_filtered = [p for p in recommended if industry in p.best_for_industries]
             if industry_filtered:
                 recommended = industry_filtered
         
-        # Filter by budget if provided
-        if budget:
-            recommended = [p for p in recommended if not p.min_budget or p.min_budget <= budget]
-        
-        # Filter by currency support
-        recommended = [p for p in recommended if currency in p.currency_support or not p.currency_support]
-        
         return recommended[:10]  # Return top 10
 
     @staticmethod
@@ -0,0 +1,374 @@
+"""
+Semantic cache for Gemini platform recommendations
+Two-tier lookup so near-identical business contexts skip the Gemini round-trip:
+- L1: exact match on the canonical context fingerprint (dict lookup)
+- L2: cosine similarity of fingerprint embeddings (brute-force scan for small caches,
+  numba-compiled when available, HNSW approximate nearest-neighbour index once the cache grows)
+Anything that misses both tiers (or only lands in the gray zone) goes to Gemini
+Results expire after ttl_seconds and are only ever served to the same business, goal, locations and brand
+"""
+import copy
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# hnswlib is optional - without it L2 always uses the brute-force NumPy scan
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+# numba is optional - without it the brute-force scan is a plain NumPy matmul
+try:
+    import numba as nb
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _cosine_probe_numpy(
+    embeddings: np.ndarray, norms: np.ndarray, query: np.ndarray, query_norm: float, mask: np.ndarray
+) -> Tuple[int, float]:
+    """Best cosine match of query against the rows of embeddings selected by mask"""
+    scores = (embeddings @ query) / (norms * query_norm)
+    scores = np.where(mask, scores, -np.inf)
+    best = int(np.argmax(scores))
+    return best, float(scores[best])
+
+
+if NUMBA_AVAILABLE:
+    # numba can't load float16, so the kernel reads the raw half bits (a free uint16 view)
+    # and decodes each element through this 65536-entry float32 table (256 KB, cache-resident)
+    _HALF_TO_FLOAT = np.arange(1 << 16, dtype=np.uint16).view(np.float16).astype(np.float32)
+
+    @nb.njit(parallel=True, fastmath=True, cache=True)
+    def _cosine_scores(half_bits, half_to_float, norms, query, query_norm):
+        scores = np.empty(half_bits.shape[0], dtype=np.float32)
+        for i in nb.prange(half_bits.shape[0]):
+            dot = np.float32(0.0)
+            for j in range(half_bits.shape[1]):
+                dot += half_to_float[half_bits[i, j]] * query[j]
+            scores[i] = dot / (norms[i] * query_norm)
+        return scores
+
+    def _cosine_probe(
+        embeddings: np.ndarray, norms: np.ndarray, query: np.ndarray, query_norm: float, mask: np.ndarray
+    ) -> Tuple[int, float]:
+        """Fused dot + norm scan compiled with numba (one pass, float16 rows, float32 accumulator)"""
+        scores = _cosine_scores(
+            embeddings.view(np.uint16), _HALF_TO_FLOAT, norms, query, np.float32(query_norm)
+        )
+        scores = np.where(mask, scores, -np.inf)
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+else:
+    _cosine_probe = _cosine_probe_numpy
+
+
+class SemanticCache:
+    """
+    In-process cache of AI recommendation results keyed by business context
+
+    Similarity bands (cosine):
+    - >= hit_threshold: semantic hit, cached result is returned
+    - gray_threshold..hit_threshold: gray zone, treated as a miss to avoid
+      returning a recommendation for a merely similar business
+    - below gray_threshold: miss
+    """
+
+    # Fields that must match exactly for an L2 hit - business identity (results carry
+    # business-specific reasoning), goal, locations and brand. Fingerprints differing in
+    # one of these are a token apart and would clear hit_threshold on cosine alone
+    SCOPE_FIELDS = (
+        "business_id",
+        "business_name",
+        "website_url",
+        "campaign_goal",
+        "target_locations",
+        "brand_description",
+        "brand_colors",
+        "brand_tone",
+        "brand_language",
+    )
+    # Context fields that drive the recommendation (see AIPlatformAnalyzer._build_context)
+    FINGERPRINT_FIELDS = SCOPE_FIELDS + (
+        "business_industry",
+        "content_type_indicators",
+    )
+    # Leading website content included in the fingerprint
+    FINGERPRINT_CONTENT_CHARS = 2000
+    # Below this many embeddings a brute-force scan beats an HNSW query
+    HNSW_MIN_ENTRIES = 2048
+    HNSW_M = 16
+    HNSW_EF_CONSTRUCTION = 200
+    HNSW_EF_SEARCH = 64
+    # Storage precision of cached embeddings - halves the matrix vs float32 and
+    # the rounding is far below the hit/gray threshold gap
+    EMBEDDING_DTYPE = np.float16
+    # Rows preallocated on the first embedded add; capacity doubles (up to max_entries) when full
+    INITIAL_CAPACITY = 64
+
+    def __init__(
+        self,
+        hit_threshold: float = 0.92,
+        gray_threshold: float = 0.85,
+        max_entries: int = 10000,
+        ttl_seconds: float = 3600,
+    ):
+        """
+        Initialize an empty cache
+
+        Args:
+            hit_threshold: Minimum cosine similarity for a semantic hit
+            gray_threshold: Lower bound of the gray zone (logged, never served)
+            max_entries: Maximum number of cached results; new results are not cached once full
+            ttl_seconds: How long a cached result is served after it was added
+        """
+        self.hit_threshold = hit_threshold
+        self.gray_threshold = gray_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # key -> (expires_at, result); insertion order is expiry order (single TTL)
+        self._exact: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # L2 rows - one per embedded result; rows of discarded results stay (alive=False)
+        # until the next compaction. The arrays below are preallocated buffers of equal
+        # capacity; only the first _count rows are in use
+        self._count = 0
+        self._keys: List[str] = []  # row -> key
+        self._rows: Dict[str, int] = {}  # key -> row, live rows only
+        self._embeddings: Optional[np.ndarray] = None  # (capacity, dim) EMBEDDING_DTYPE
+        self._norms: Optional[np.ndarray] = None  # (capacity,) L2 norms of _embeddings rows
+        self._expires: Optional[np.ndarray] = None  # (capacity,) expires_at per row
+        self._scopes: Optional[np.ndarray] = None  # (capacity,) object - scope per row
+        self._alive: Optional[np.ndarray] = None  # (capacity,) bool
+        self._dead = 0
+        self._index = None  # hnswlib.Index over _embeddings rows, built past HNSW_MIN_ENTRIES
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    @staticmethod
+    def fingerprint(context: Dict[str, Any]) -> str:
+        """Build a canonical string from the recommendation-relevant parts of the context"""
+        canonical = {field: context.get(field) for field in SemanticCache.FINGERPRINT_FIELDS}
+        canonical["website_content"] = (context.get("website_content_full") or "")[
+            : SemanticCache.FINGERPRINT_CONTENT_CHARS
+        ]
+        return json.dumps(canonical, sort_keys=True, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def scope(context: Dict[str, Any]) -> str:
+        """Exact-match part of the context (SCOPE_FIELDS) - L2 matches never cross scopes"""
+        return json.dumps([context.get(field) for field in SemanticCache.SCOPE_FIELDS], default=str)
+
+    @staticmethod
+    def _key(fingerprint: str) -> str:
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def get_exact(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """L1 lookup - exact fingerprint match"""
+        key = self._key(fingerprint)
+        entry = self._exact.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._discard(key)
+            return None
+        return copy.deepcopy(entry[1])
+
+    def get_similar(
+        self,
+        embedding: List[float],
+        scope: str,
+        is_valid: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        L2 lookup - best cosine match above hit_threshold within scope
+
+        A match rejected by is_valid is discarded from the cache and reported as a miss
+        """
+        if not self._count:
+            return None
+
+        query = np.asarray(embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if query_norm == 0.0 or query.shape[0] != self._embeddings.shape[1]:
+            return None
+
+        n = self._count
+        mask = self._alive[:n] & (self._expires[:n] > time.monotonic()) & (self._scopes[:n] == scope)
+        if not mask.any():
+            return None
+
+        if self._index is not None:
+            try:
+                labels, distances = self._index.knn_query(
+                    query, k=1, num_threads=1, filter=lambda label: bool(mask[label])
+                )
+            except RuntimeError:  # Filtered search found no candidate
+                return None
+            best = int(labels[0][0])
+            score = 1.0 - float(distances[0][0])  # hnswlib cosine distance = 1 - similarity
+        else:
+            best, score = _cosine_probe(self._embeddings[:n], self._norms[:n], query, query_norm, mask)
+
+        if score >= self.hit_threshold:
+            key = self._keys[best]
+            result = self._exact[key][1]
+            if is_valid is not None and not is_valid(result):
+                self._discard(key)
+                return None
+            return copy.deepcopy(result)
+        if score >= self.gray_threshold:
+            logger.info("[CACHE] Semantic cache gray-zone match (%.3f) - calling Gemini", score)
+        return None
+
+    def add(
+        self,
+        fingerprint: str,
+        result: Dict[str, Any],
+        embedding: Optional[List[float]] = None,
+        scope: str = "",
+    ) -> None:
+        """Store a result under its fingerprint (and embedding within scope, if one was computed)"""
+        key = self._key(fingerprint)
+        now = time.monotonic()
+        entry = self._exact.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                return
+            self._discard(key)
+        if len(self._exact) >= self.max_entries:
+            self._evict_expired(now)
+            if len(self._exact) >= self.max_entries:
+                return
+
+        stored = copy.deepcopy(result)
+        expires_at = now + self.ttl_seconds
+        self._exact[key] = (expires_at, stored)
+
+        if embedding is None:
+            return
+        vector = np.asarray(embedding, dtype=self.EMBEDDING_DTYPE)
+        norm = float(np.linalg.norm(vector.astype(np.float32)))
+        if norm == 0.0:
+            return
+        if self._embeddings is not None and vector.shape[0] != self._embeddings.shape[1]:
+            return
+        # Discarded rows still hold HNSW capacity (max_entries) - drop them before growing
+        if self._dead and (self._count >= self.max_entries or self._dead * 2 > self._count):
+            self._compact()
+
+        if self._embeddings is None or self._count == self._embeddings.shape[0]:
+            self._grow(vector.shape[0])
+        row = self._count
+        self._embeddings[row] = vector
+        self._norms[row] = norm
+        self._expires[row] = expires_at
+        self._scopes[row] = scope
+        self._alive[row] = True
+        self._count += 1
+        self._rows[key] = row
+        self._keys.append(key)
+
+        if self._index is not None:
+            self._index.add_items(vector.astype(np.float32).reshape(1, -1), np.array([row]))
+        elif HNSW_AVAILABLE and self._count >= self.HNSW_MIN_ENTRIES:
+            self._build_index()
+
+    def _grow(self, dim: int) -> None:
+        """Allocate the row buffers, or double their capacity (amortized O(1) adds)"""
+        old = 0 if self._embeddings is None else self._embeddings.shape[0]
+        capacity = min(max(self.INITIAL_CAPACITY, old * 2), max(self.max_entries, old + 1))
+        embeddings = np.empty((capacity, dim), dtype=self.EMBEDDING_DTYPE)
+        norms = np.empty(capacity, dtype=np.float32)
+        expires = np.empty(capacity)
+        scopes = np.empty(capacity, dtype=object)
+        alive = np.zeros(capacity, dtype=bool)
+        if old:
+            n = self._count
+            embeddings[:n] = self._embeddings[:n]
+            norms[:n] = self._norms[:n]
+            expires[:n] = self._expires[:n]
+            scopes[:n] = self._scopes[:n]
+            alive[:n] = self._alive[:n]
+        self._embeddings = embeddings
+        self._norms = norms
+        self._expires = expires
+        self._scopes = scopes
+        self._alive = alive
+
+    def discard(self, fingerprint: str) -> None:
+        """Drop the result cached under fingerprint (e.g. it references a removed platform)"""
+        self._discard(self._key(fingerprint))
+
+    def _discard(self, key: str) -> None:
+        self._exact.pop(key, None)
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._alive[row] = False
+            self._dead += 1
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop expired results (oldest first - stops at the first live one)"""
+        expired = []
+        for key, (expires_at, _) in self._exact.items():
+            if expires_at > now:
+                break
+            expired.append(key)
+        for key in expired:
+            self._discard(key)
+
+    def _compact(self) -> None:
+        """Rewrite the L2 rows without discarded results (rebuilds the HNSW index)"""
+        keep = np.flatnonzero(self._alive[: self._count])
+        n = keep.size
+        self._index = None
+        self._dead = 0
+        # Live rows move to the front of the same buffers (capacity is kept)
+        self._embeddings[:n] = self._embeddings[keep]
+        self._norms[:n] = self._norms[keep]
+        self._expires[:n] = self._expires[keep]
+        self._scopes[:n] = self._scopes[keep]
+        self._alive[:n] = True
+        self._alive[n:] = False
+        self._scopes[n:] = None
+        self._count = n
+        self._keys = [self._keys[row] for row in keep]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        if HNSW_AVAILABLE and n >= self.HNSW_MIN_ENTRIES:
+            self._build_index()
+
+    def _build_index(self) -> None:
+        """Build the HNSW index over every stored embedding (row number = label)"""
+        index = hnswlib.Index(space="cosine", dim=self._embeddings.shape[1])
+        index.init_index(
+            max_elements=self.max_entries,
+            ef_construction=self.HNSW_EF_CONSTRUCTION,
+            M=self.HNSW_M,
+        )
+        index.add_items(self._embeddings[: self._count].astype(np.float32), np.arange(self._count))
+        index.set_ef(self.HNSW_EF_SEARCH)
+        self._index = index
+
+    def clear(self) -> None:
+        """Drop all cached results"""
+        self._exact.clear()
+        self._count = 0
+        self._keys = []
+        self._rows = {}
+        self._embeddings = None
+        self._norms = None
+        self._expires = None
+        self._scopes = None
+        self._alive = None
+        self._dead = 0
+        self._index = None
@@ -2,7 +2,8 @@
 User service - Business logic for user operations
 """
 from typing import Optional
-from datetime import datetime
+
+from beanie import UpdateResponse
 
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
@@ -32,45 +33,31 @@ class UserService:
     
     @staticmethod
     async def update_user(clerk_id: str, user_data: UserUpdate) -> Optional[User]:
-        """Update user information"""
-        user = await UserService.get_by_clerk_id(clerk_id)
-        
-        if not user:
-            return None
-        
-        # Update only provided fields
+        """Update user information (single atomic update)"""
+        # Update only provided fields; updated_at is stamped server-side
         update_data = user_data.model_dump(exclude_unset=True)
-        update_data["updated_at"] = datetime.utcnow()
-        
-        for field, value in update_data.items():
-            setattr(user, field, value)
+        update = {"$currentDate": {"updated_at": True}}
+        if update_data:
+            update["$set"] = update_data
         
-        await user.save()
-        return user
+        return await User.find_one(User.clerk_id == clerk_id).update(
+            update,
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
     
     @staticmethod
     async def delete_user(clerk_id: str) -> bool:
         """Delete user (called from Clerk webhook)"""
-        user = await UserService.get_by_clerk_id(clerk_id)
-        
-        if not user:
-            return False
-        
-        await user.delete()
-        return True
+        result = await User.find_one(User.clerk_id == clerk_id).delete()
+        return result is not None and result.deleted_count > 0
     
     @staticmethod
     async def update_last_login(clerk_id: str) -> Optional[User]:
-        """Update user's last login timestamp"""
-        user = await UserService.get_by_clerk_id(clerk_id)
-        
-        if not user:
-            return None
-        
-        user.last_login_at = datetime.utcnow()
-        user.updated_at = datetime.utcnow()
-        await user.save()
-        return user
+        """Update user's last login timestamp (single atomic update, stamped server-side)"""
+        return await User.find_one(User.clerk_id == clerk_id).update(
+            {"$currentDate": {"last_login_at": True, "updated_at": True}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
     
     @staticmethod
     async def get_or_create_user(clerk_id: str, email: str, **kwargs) -> User:
@@ -2,266 +2,265 @@
 Standalone script to seed platforms into MongoDB
 Run: python3 seed_platforms_standalone.py
 """
+import argparse
+import asyncio
+import atexit
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Tuple
+
+import orjson
 import pymongo
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# MongoDB error code for a unique index violation
+DUPLICATE_KEY_ERROR = 11000
+
+# Per-platform report lines, formatted straight from the platform mapping
+_CREATED_LINE = "✅ Created platform: {name} (ID: {platform_id})".format_map
+_SKIPPED_LINE = "⏭️  Platform {name} (ID: {platform_id}) already exists, skipping...".format_map
+
+# URLs that point at a local MongoDB
+_LOCAL_URL_PREFIXES = ("mongodb://localhost", "mongodb://127.0.0.1")
+
+# Platform records live in seed_data/platforms.json (parsed by orjson, no giant literal to compile)
+_RAW_PLATFORMS = orjson.loads(Path(__file__).parent.joinpath("seed_data", "platforms.json").read_bytes())
+
+
+def _freeze(platform: dict) -> dict:
+    """Intern string values and turn list values into tuples (seed data is read-only)"""
+    return {
+        key: tuple(sys.intern(item) for item in value) if isinstance(value, list)
+        else sys.intern(value) if isinstance(value, str)
+        else value
+        for key, value in platform.items()
+    }
+
+
+# Read-only views - shared goal/industry/currency strings are a single object each
+PLATFORMS_DATA = tuple(MappingProxyType(_freeze(p)) for p in _RAW_PLATFORMS)
+del _RAW_PLATFORMS
+
+# Insert ops built once per process and resent on every run (index-aligned with PLATFORMS_DATA).
+# InsertOne stores the _id it assigns on its document, so each op owns a dict copy - repeated
+# runs against a fresh database reuse the same _ids
+_PREPARED_OPS = tuple(pymongo.InsertOne(dict(p)) for p in PLATFORMS_DATA)
+
+_PLATFORM_IDS = [p["platform_id"] for p in PLATFORMS_DATA]
+_PLATFORM_ID_SET = frozenset(_PLATFORM_IDS)
+
+
+@lru_cache(maxsize=None)
+def _load_env() -> None:
+    """Load .env once per process (later calls are no-ops)"""
+    load_dotenv()
+
+
+def _is_single_local_node(mongodb_url: str) -> bool:
+    """Whether the URL names one local host and no replica set (or explicit directConnection)"""
+    if not mongodb_url.startswith(_LOCAL_URL_PREFIXES):
+        return False
+    parsed = pymongo.uri_parser.parse_uri(mongodb_url)
+    options = parsed["options"]
+    return len(parsed["nodelist"]) == 1 and "replicaSet" not in options and "directConnection" not in options
+
+
+@lru_cache(maxsize=4)
+def _get_client(mongodb_url: str) -> pymongo.MongoClient:
+    """MongoClient per URL, reused across seed_platforms() calls in the same process"""
+    options = {}
+    if _is_single_local_node(mongodb_url):
+        # Single-node dev databases don't need topology discovery
+        options["directConnection"] = True
+    client = pymongo.MongoClient(
+        mongodb_url,
+        maxPoolSize=10,
+        retryWrites=True,
+        # Repetitive English text compresses well (zlib ships with Python - no extra package)
+        compressors="zlib",
+        # Fail fast on a wrong URL instead of the 30s default
+        serverSelectionTimeoutMS=3000,
+        **options,
+    )
+    atexit.register(client.close)
+    return client
 
-PLATFORMS_DATA = [
-    {
-        "platform_id": 0,
-        "name": "Google Ads",
-        "slug": "google-ads",
-        "type": "search",
-        "description": "Appear with your ads on top of the world's first search engine.",
-        "icon": "Search",
-        "supports_search": True,
-        "supports_display": True,
-        "supports_video": True,
-        "supports_shopping": True,
-        "supports_mobile": True,
-        "best_for_goals": ["website-traffic", "online-leads", "online-sales"],
-        "best_for_industries": ["Technology", "E-commerce", "Retail", "Professional Services"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "INR", "EUR", "GBP", "AUD", "CAD"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 1,
-        "name": "Facebook Ads",
-        "slug": "facebook-ads",
-        "type": "social",
-        "description": "Appear with your ads in the newsfeed & stories & reels of your audience.",
-        "icon": "Facebook",
-        "supports_display": True,
-        "supports_video": True,
-        "supports_mobile": True,
-        "best_for_goals": ["brand-awareness", "online-leads", "online-sales"],
-        "best_for_industries": ["E-commerce", "Retail", "Food & Beverage", "Media & Entertainment"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "INR", "EUR", "GBP"],
-        "requires_own_account": True,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 2,
-        "name": "Instagram Ads",
-        "slug": "instagram-ads",
-        "type": "social",
-        "description": "Appear with your ads in the newsfeed, stories & reels of your audience.",
-        "icon": "Instagram",
-        "supports_display": True,
-        "supports_video": True,
-        "supports_mobile": True,
-        "best_for_goals": ["brand-awareness", "online-sales"],
-        "best_for_industries": ["E-commerce", "Fashion", "Food & Beverage", "Media & Entertainment"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "INR", "EUR", "GBP"],
-        "requires_own_account": True,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 3,
-        "name": "LinkedIn Ads",
-        "slug": "linkedin-ads",
-        "type": "social",
-        "description": "Engage a community of professionals to drive actions that are relevant to your business.",
-        "icon": "Linkedin",
-        "supports_display": True,
-        "supports_video": True,
-        "best_for_goals": ["online-leads", "brand-awareness"],
-        "best_for_industries": ["Technology", "Professional Services", "Consulting", "Finance"],
-        "min_budget": 10.0,
-        "currency_support": ["USD", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 4,
-        "name": "Twitter Ads",
-        "slug": "twitter-ads",
-        "type": "social",
-        "description": "Appear with your ads in the timeline & search results of your audience.",
-        "icon": "Twitter",
-        "supports_display": True,
-        "supports_video": True,
-        "best_for_goals": ["brand-awareness", "online-leads"],
-        "best_for_industries": ["Technology", "Media & Entertainment", "Marketing & Advertising"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "EUR", "GBP"],
-        "requires_own_account": True,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 8,
-        "name": "YouTube Ads",
-        "slug": "youtube-ads",
-        "type": "video",
-        "description": "Video advertising on YouTube",
-        "icon": "Youtube",
-        "supports_video": True,
-        "supports_display": True,
-        "best_for_goals": ["brand-awareness", "website-traffic"],
-        "best_for_industries": ["Media & Entertainment", "Education", "Technology"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "INR", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 10,
-        "name": "TikTok Ads",
-        "slug": "tiktok-ads",
-        "type": "video",
-        "description": "Short-form video advertising",
-        "icon": "Music",
-        "supports_video": True,
-        "supports_mobile": True,
-        "best_for_goals": ["brand-awareness", "online-sales"],
-        "best_for_industries": ["E-commerce", "Media & Entertainment", "Food & Beverage"],
-        "min_budget": 20.0,
-        "currency_support": ["USD", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 17,
-        "name": "Microsoft Ads",
-        "slug": "microsoft-ads",
-        "type": "search",
-        "description": "Appear with your ads on top of Bing, Yahoo! & other search partners.",
-        "icon": "Search",
-        "supports_search": True,
-        "supports_display": True,
-        "best_for_goals": ["website-traffic", "online-leads"],
-        "best_for_industries": ["Technology", "Professional Services", "E-commerce"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 19,
-        "name": "Google Performance Max",
-        "slug": "google-performance-max",
-        "type": "display",
-        "description": "Performance Max is a goal-based campaign that allows advertisers to access all of the Google Ads inventory in a single campaign.",
-        "icon": "TrendingUp",
-        "supports_search": True,
-        "supports_display": True,
-        "supports_video": True,
-        "supports_shopping": True,
-        "supports_mobile": True,
-        "best_for_goals": ["website-traffic", "online-sales", "online-leads"],
-        "best_for_industries": ["E-commerce", "Retail", "Technology"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "INR", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 20,
-        "name": "Online Bannering",
-        "slug": "online-bannering",
-        "type": "display",
-        "description": "Reach a broad audience and build awareness",
-        "icon": "Monitor",
-        "supports_display": True,
-        "best_for_goals": ["brand-awareness"],
-        "best_for_industries": ["E-commerce", "Retail", "Media & Entertainment"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "INR", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-    {
-        "platform_id": 18,
-        "name": "Amazon Ads",
-        "slug": "amazon-ads",
-        "type": "shopping",
-        "description": "Product advertising on Amazon",
-        "icon": "ShoppingCart",
-        "supports_shopping": True,
-        "supports_display": True,
-        "best_for_goals": ["online-sales"],
-        "best_for_industries": ["E-commerce", "Retail"],
-        "min_budget": 1.0,
-        "currency_support": ["USD", "EUR", "GBP"],
-        "requires_own_account": False,
-        "is_active": True,
-        "is_beta": False,
-    },
-]
+
+def _ensure_unique_platform_id(platforms_collection) -> bool:
+    """Make sure platform_id is uniquely indexed; False if that isn't possible"""
+    try:
+        # Built before any write so the insert batch only pays per-document index upkeep
+        # (background is implied on MongoDB >= 4.2; stated for older servers)
+        platforms_collection.create_index(
+            [("platform_id", pymongo.ASCENDING)], unique=True, background=True, name="platform_id_unique"
+        )
+        return True
+    except pymongo.errors.OperationFailure as e:
+        # A unique platform_id index built under another name (e.g. by an older seeder) works just as well
+        if any(
+            info.get("unique") and info["key"] == [("platform_id", pymongo.ASCENDING)]
+            for info in platforms_collection.index_information().values()
+        ):
+            return True
+        # e.g. the app already created a non-unique platform_id index
+        print(f"⚠️  Could not create unique platform_id index ({e.details.get('codeName', e)}), using upserts...")
+        return False
+
+
+def _write_platforms(
+    platforms_collection, indices: range, use_insert: bool
+) -> Tuple[List[int], List[int], List[str]]:
+    """
+    Write the PLATFORMS_DATA entries at indices in one unordered bulk request
+    
+    Returns:
+        (indices of created platforms, indices of failed platforms, warning lines for failed writes)
+    
+    Platforms that are neither created nor failed already existed (duplicate key or no upsert)
+    """
+    platforms = [PLATFORMS_DATA[i] for i in indices]
+    if not platforms:
+        return [], [], []
+    write_errors = []
+    if use_insert:
+        # Unique index rejects existing platforms server-side - no existence check needed
+        try:
+            # Trusted seed data - skip any collection validator
+            platforms_collection.bulk_write(
+                [_PREPARED_OPS[i] for i in indices], ordered=False, bypass_document_validation=True
+            )
+        except pymongo.errors.BulkWriteError as e:
+            write_errors = e.details["writeErrors"]
+        rejected = {error["index"] for error in write_errors}
+        created = [j for j in range(len(platforms)) if j not in rejected]
+    else:
+        # Without the unique index, insert-if-missing upserts keep reseeding idempotent
+        ops = [
+            pymongo.UpdateOne({"platform_id": p["platform_id"]}, {"$setOnInsert": p}, upsert=True)
+            for p in platforms
+        ]
+        try:
+            result = platforms_collection.bulk_write(ops, ordered=False, bypass_document_validation=True)
+            created = list(result.upserted_ids)
+        except pymongo.errors.BulkWriteError as e:
+            # Keep the ops that succeeded alongside the ones that failed
+            write_errors = e.details["writeErrors"]
+            created = [u["index"] for u in e.details["upserted"]]
+    
+    # A duplicate key means the platform already exists; anything else is a real failure
+    failed = []
+    errors = []
+    for error in write_errors:
+        if error["code"] != DUPLICATE_KEY_ERROR:
+            failed.append(indices[error["index"]])
+            errors.append(f"⚠️  Platform {platforms[error['index']]['name']} failed: {error['errmsg']}")
+    return [indices[j] for j in created], failed, errors
 
 
-def seed_platforms():
-    """Seed platforms into database"""
+def seed_platforms(parallel: int = 1):
+    """
+    Seed platforms into database
+    
+    Args:
+        parallel: Number of concurrent bulk requests (1 is plenty for the current platform list)
+    """
+    _load_env()
+    
     # Get MongoDB URL from environment
     mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     mongodb_db_name = os.getenv("MONGODB_DB_NAME", "admaster")
     
     print(f"🔌 Connecting to MongoDB: {mongodb_db_name}")
     
-    client = None
     try:
-        # Connect to MongoDB
-        client = pymongo.MongoClient(mongodb_url)
+        # Connect to MongoDB (pooled client is closed at interpreter exit)
+        client = _get_client(mongodb_url)
         db = client[mongodb_db_name]
-        platforms_collection = db["platforms"]
+        # Seeding is idempotent (a re-run repairs any lost write), so skip the majority/journal ack wait
+        platforms_collection = db.get_collection(
+            "platforms", write_concern=pymongo.WriteConcern(w=1, j=False)
+        )
+        
+        # Re-runs usually find every platform already there - one query instead of index + bulk write.
+        # Distinct ids, not a document count: duplicates from before the unique index could mask a gap
+        present = platforms_collection.distinct("platform_id", {"platform_id": {"$in": _PLATFORM_IDS}})
+        if _PLATFORM_ID_SET.issubset(present):
+            print("✅ All platforms present, nothing to do")
+            return
         
         print("🌱 Seeding platforms...\n")
         
-        created_count = 0
-        skipped_count = 0
+        # Report is buffered and written once; per-platform lines only when SEED_VERBOSE is on
+        verbose = os.getenv("SEED_VERBOSE", "1") != "0"
+        log_lines = []
         
-        for platform_data in PLATFORMS_DATA:
-            # Check if platform already exists
-            existing = platforms_collection.find_one(
-                {"platform_id": platform_data["platform_id"]}
-            )
-            
-            if existing:
-                print(f"⏭️  Platform {platform_data['name']} (ID: {platform_data['platform_id']}) already exists, skipping...")
-                skipped_count += 1
-                continue
-            
-            # Insert platform
-            platforms_collection.insert_one(platform_data)
-            print(f"✅ Created platform: {platform_data['name']} (ID: {platform_data['platform_id']})")
-            created_count += 1
+        use_insert = _ensure_unique_platform_id(platforms_collection)
         
-        # Count total platforms
-        total = platforms_collection.count_documents({})
-        print(f"\n{'='*50}")
-        print(f"✅ Platform seeding complete!")
-        print(f"   Created: {created_count}")
-        print(f"   Skipped: {skipped_count}")
-        print(f"   Total platforms in DB: {total}")
-        print(f"{'='*50}")
+        # Interleaved shards, one bulk request per worker (PyMongo's pool serves each thread)
+        shards = [range(i, len(PLATFORMS_DATA), parallel) for i in range(parallel)]
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            results = list(executor.map(
+                lambda shard: _write_platforms(platforms_collection, shard, use_insert), shards
+            ))
+        created = []
+        failed = []
+        for shard_created, shard_failed, shard_errors in results:
+            created += shard_created
+            failed += shard_failed
+            log_lines += shard_errors
+        
+        created = set(created)
+        failed = set(failed)
+        if verbose:
+            # Failed platforms were already reported with their error
+            for i, platform_data in enumerate(PLATFORMS_DATA):
+                if i in created:
+                    log_lines.append(_CREATED_LINE(platform_data))
+                elif i not in failed:
+                    log_lines.append(_SKIPPED_LINE(platform_data))
+        created_count = len(created)
+        failed_count = len(failed)
+        skipped_count = len(PLATFORMS_DATA) - created_count - failed_count
+        
+        # Count total platforms (collection metadata - no scan; exact enough for a summary)
+        total = platforms_collection.estimated_document_count()
+        log_lines += [
+            "",
+            "=" * 50,
+            "✅ Platform seeding complete!",
+            f"   Created: {created_count}",
+            f"   Skipped: {skipped_count}",
+            f"   Failed: {failed_count}",
+            f"   Total platforms in DB: {total}",
+            "=" * 50,
+        ]
+        sys.stdout.write("\n".join(log_lines) + "\n")
         
     except Exception as e:
         print(f"❌ Error seeding platforms: {e}")
         import traceback
         traceback.print_exc()
         raise
-    finally:
-        if client:
-            client.close()
+
+
+async def seed_platforms_async(parallel: int = 1):
+    """
+    Seed platforms without blocking the event loop
+    Lets async callers overlap seeding (connect, index check, inserts) with their own startup
+    work, e.g. asyncio.gather(seed_platforms_async(), other_startup())
+    """
+    await asyncio.to_thread(seed_platforms, parallel)
 
 
 if __name__ == "__main__":
-    seed_platforms()
+    parser = argparse.ArgumentParser(description="Seed platforms into MongoDB")
+    parser.add_argument(
+        "--parallel", type=int, default=1,
+        help="Concurrent bulk requests to split the platform list across (default: 1)",
+    )
+    seed_platforms(parallel=max(1, parser.parse_args().parallel))
 
@@ -0,0 +1,66 @@
+"""
+Tests for AIPlatformAnalyzer.analyze_and_recommend_batch
+"""
+import asyncio
+
+from app.services import ai_platform_analyzer
+from app.services.ai_platform_analyzer import AIPlatformAnalyzer
+
+
+def _analyzer(monkeypatch, recommend):
+    """Analyzer whose context building and per-context recommendation are stubbed"""
+    analyzer = AIPlatformAnalyzer.__new__(AIPlatformAnalyzer)
+    monkeypatch.setattr(
+        AIPlatformAnalyzer,
+        "_build_context",
+        lambda self, conversion_goal, business, **kwargs: {
+            "business_id": business,
+            "campaign_goal": conversion_goal,
+        },
+    )
+    monkeypatch.setattr(AIPlatformAnalyzer, "_recommend", recommend)
+    return analyzer
+
+
+def test_batch_analyzes_each_distinct_context_once_and_keeps_order(monkeypatch):
+    calls = []
+
+    async def recommend(self, context, conversion_goal):
+        calls.append(context["business_id"])
+        return {"recommended_platform_id": context["business_id"]}
+
+    analyzer = _analyzer(monkeypatch, recommend)
+    requests = [
+        {"conversion_goal": "online-sales", "business": "a"},
+        {"conversion_goal": "online-sales", "business": "b"},
+        {"conversion_goal": "online-sales", "business": "a"},
+    ]
+
+    results = asyncio.run(analyzer.analyze_and_recommend_batch(requests))
+
+    assert sorted(calls) == ["a", "b"]
+    assert [r["recommended_platform_id"] for r in results] == ["a", "b", "a"]
+    # Duplicates get independent copies
+    results[0]["recommended_platform_id"] = "changed"
+    assert results[2]["recommended_platform_id"] == "a"
+
+
+def test_batch_caps_concurrent_recommendations(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def recommend(self, context, conversion_goal):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"recommended_platform_id": context["business_id"]}
+
+    analyzer = _analyzer(monkeypatch, recommend)
+    requests = [{"conversion_goal": "online-sales", "business": str(i)} for i in range(20)]
+
+    results = asyncio.run(analyzer.analyze_and_recommend_batch(requests))
+
+    assert len(results) == 20
+    assert peak == ai_platform_analyzer.BATCH_MAX_CONCURRENCY
@@ -0,0 +1,103 @@
+"""
+Tests for the semantic recommendation cache
+"""
+import numpy as np
+import pytest
+
+from app.services import semantic_cache
+from app.services.semantic_cache import SemanticCache
+
+
+def _embedding(seed: int, dim: int = 64) -> list:
+    return np.random.default_rng(seed).standard_normal(dim).tolist()
+
+
+def test_add_then_get_similar_returns_cached_result():
+    cache = SemanticCache()
+    cache.add("fingerprint", {"recommended_platform_id": 1}, _embedding(0), "business-a")
+
+    assert cache.get_similar(_embedding(0), "business-a") == {"recommended_platform_id": 1}
+    assert cache.get_similar(_embedding(1), "business-a") is None
+
+
+def test_results_are_not_shared_across_businesses():
+    context = {"campaign_goal": "online-sales", "business_industry": "retail"}
+    first = dict(context, business_id="a", business_name="Shop A", website_url="https://a.example")
+    second = dict(context, business_id="b", business_name="Shop B", website_url="https://b.example")
+    cache = SemanticCache()
+    cache.add(
+        SemanticCache.fingerprint(first), {"recommended_platform_id": 1},
+        _embedding(0), SemanticCache.scope(first),
+    )
+
+    assert SemanticCache.fingerprint(first) != SemanticCache.fingerprint(second)
+    assert cache.get_exact(SemanticCache.fingerprint(second)) is None
+    assert cache.get_similar(_embedding(0), SemanticCache.scope(second)) is None
+
+
+def test_different_goal_for_same_business_misses():
+    business = {"business_id": "a", "business_name": "Shop A", "website_url": "https://a.example"}
+    sales = dict(business, campaign_goal="online-sales", target_locations=["India"])
+    awareness = dict(sales, campaign_goal="brand-awareness")
+    abroad = dict(sales, target_locations=["Germany"])
+    cache = SemanticCache()
+    cache.add(
+        SemanticCache.fingerprint(sales), {"recommended_platform_id": 1},
+        _embedding(0), SemanticCache.scope(sales),
+    )
+
+    # Same embedding - only the scope separates them
+    assert cache.get_similar(_embedding(0), SemanticCache.scope(sales)) == {"recommended_platform_id": 1}
+    assert cache.get_exact(SemanticCache.fingerprint(awareness)) is None
+    assert cache.get_similar(_embedding(0), SemanticCache.scope(awareness)) is None
+    assert cache.get_similar(_embedding(0), SemanticCache.scope(abroad)) is None
+
+
+def test_expired_results_are_not_served():
+    cache = SemanticCache(ttl_seconds=0)
+    cache.add("fingerprint", {"recommended_platform_id": 1}, _embedding(0), "business-a")
+
+    assert cache.get_exact("fingerprint") is None
+    assert cache.get_similar(_embedding(0), "business-a") is None
+
+
+def test_invalid_semantic_match_is_discarded():
+    cache = SemanticCache()
+    cache.add("fingerprint", {"recommended_platform_id": 1}, _embedding(0), "business-a")
+
+    assert cache.get_similar(_embedding(0), "business-a", lambda result: False) is None
+    assert cache.get_exact("fingerprint") is None
+    assert cache.get_similar(_embedding(0), "business-a") is None
+    assert len(cache) == 0
+
+
+def test_numba_probe_reads_stored_embeddings():
+    pytest.importorskip("numba")
+    assert semantic_cache._cosine_probe is not semantic_cache._cosine_probe_numpy
+
+    cache = SemanticCache()
+    cache.add("a", {"recommended_platform_id": 1}, _embedding(0), "business-a")
+    cache.add("b", {"recommended_platform_id": 2}, _embedding(1), "business-a")
+
+    assert cache.get_similar(_embedding(1), "business-a") == {"recommended_platform_id": 2}
+
+
+def test_embeddings_are_stored_as_float16():
+    cache = SemanticCache()
+    cache.add("fingerprint", {"recommended_platform_id": 1}, _embedding(0), "business-a")
+
+    assert cache._embeddings.dtype == np.float16
+
+
+def test_numba_probe_accepts_float16_rows():
+    pytest.importorskip("numba")
+    rows = np.asarray([_embedding(0), _embedding(1)], dtype=np.float16)
+    norms = np.linalg.norm(rows.astype(np.float32), axis=1).astype(np.float32)
+    query = rows[1].astype(np.float32)
+
+    mask = np.ones(len(rows), dtype=bool)
+
+    best, score = semantic_cache._cosine_probe(rows, norms, query, float(np.linalg.norm(query)), mask)
+
+    assert best == 1
+    assert score == pytest.approx(1.0, abs=1e-3)